@@ -3,13 +3,19 @@ Migration script to add AI features fields to database
 Run this script to add AI-related columns to users, flashcards, and create ai_usage_logs table
 
 Usage:
-    python add_ai_fields.py
+    python add_ai_fields.py [--yes] [--verify]
+
+Step-by-step progress is logged at INFO level; run with MIGRATE_LOG=INFO to see it.
 """
 
+import argparse
+import logging
 import sqlite3
 import os
 import sys
 
+log = logging.getLogger("migrate")
+
 
 def get_database_path():
     """Find the actual database location"""
@@ -19,228 +25,265 @@ def get_database_path():
         "flashcards.db",
     ]
 
+    # List each candidate directory once rather than stat()-ing every path
+    listings = {}
     for path in possible_paths:
-        if os.path.exists(path):
+        directory, filename = os.path.split(path)
+        if directory not in listings:
+            try:
+                with os.scandir(directory or ".") as entries:
+                    listings[directory] = {entry.name for entry in entries}
+            except (FileNotFoundError, NotADirectoryError):
+                listings[directory] = set()
+        if filename in listings[directory]:
             return path
 
-    print("❌ Database not found in any of these locations:")
-    for path in possible_paths:
-        print(f"   - {path}")
+    log.error(
+        "❌ Database not found in any of these locations:\n%s",
+        "\n".join(f"   - {path}" for path in possible_paths),
+    )
     return None
 
 
-def migrate_database(db_path):
-    """Add AI feature fields to the database"""
-
-    print(f"📂 Using database: {db_path}")
+# Bit set in PRAGMA user_version once this migration has run. Each migration
+# script owns one bit, so they can run in any order without one marking
+# another as done. Bits 0-7 held an earlier shared version number and are
+# ignored.
+AI_FIELDS_MIGRATED = 1 << 8
+
+# Seconds to wait for the database write lock before giving up
+BUSY_TIMEOUT_SECONDS = 30
+
+# (table, column, column definition) for every AI column this migration adds
+MIGRATIONS = [
+    ("users", "ai_enabled", "BOOLEAN NOT NULL DEFAULT 0"),
+    ("users", "ai_credits", "INTEGER DEFAULT 100"),
+    ("users", "ai_provider", "VARCHAR(20) DEFAULT 'gemini'"),
+    ("flashcards", "ai_generated", "BOOLEAN NOT NULL DEFAULT 0"),
+    ("flashcards", "generation_prompt", "TEXT"),
+    ("flashcards", "ai_provider", "VARCHAR(20)"),
+]
+
+# Pre-built ALTER statements, keyed by (table, column)
+COLUMN_DDL = {
+    (table, column): f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+    for table, column, definition in MIGRATIONS
+}
+
+# cost is declared REAL to match how SQLite actually stores it. updated_at is
+# kept to match BaseModel, which writes it on every insert.
+AI_USAGE_LOGS_DDL = """
+    CREATE TABLE ai_usage_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        operation_type VARCHAR(50) NOT NULL,
+        tokens_used INTEGER DEFAULT 0,
+        cost REAL DEFAULT 0.0,
+        success BOOLEAN DEFAULT 1,
+        error_message TEXT,
+        request_data TEXT,
+        response_data TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    )
+"""
 
-    conn = sqlite3.connect(db_path)
+# Index name -> (indexed table, CREATE INDEX statement)
+INDEX_DDL = {
+    # Usage queries filter on user_id and range/order on created_at, so a
+    # single composite index serves both. By the leftmost-prefix rule it also
+    # covers user_id-only lookups.
+    "idx_ai_usage_user_time": (
+        "ai_usage_logs",
+        "CREATE INDEX idx_ai_usage_user_time "
+        "ON ai_usage_logs(user_id, created_at DESC)"
+    ),
+    # ai_generated is a boolean, so a full index on it is almost never chosen
+    # by the planner. A partial index holds only the AI-generated rows, keyed
+    # the way they are listed (per deck, by creation time), and manual inserts
+    # skip index maintenance entirely.
+    "idx_flashcards_ai_gen_true": (
+        "flashcards",
+        "CREATE INDEX idx_flashcards_ai_gen_true "
+        "ON flashcards(deck_id, created_at) WHERE ai_generated = 1"
+    ),
+}
+
+# Indexes from earlier versions of this migration, superseded by INDEX_DDL
+OBSOLETE_INDEXES = (
+    "idx_ai_usage_user_id",
+    "idx_ai_usage_created_at",
+    "idx_flashcards_ai_generated",
+)
+
+_schema_cache = {}
+
+
+def introspect(conn, refresh=False):
+    """Return cached schema info: table names, index names and per-table columns"""
+    if refresh or not _schema_cache:
+        rows = conn.execute("SELECT type, name FROM sqlite_master").fetchall()
+        _schema_cache["tables"] = {name for kind, name in rows if kind == "table"}
+        _schema_cache["indexes"] = {name for kind, name in rows if kind == "index"}
+        _schema_cache["columns"] = {
+            table: {col[1] for col in conn.execute(f"PRAGMA table_info({table})")}
+            for table in ("users", "flashcards")
+        }
+    return _schema_cache
+
+
+def migrate_database(db_path, verify=False):
+    """Add AI feature fields to the database
+
+    A failed DDL statement raises immediately and rolls the batch back, so the
+    post-migration structure check only runs when verify is True.
+    """
+
+    log.info("📂 Using database: %s", db_path)
+
+    # SQLite allows a single writer at a time, so the users and flashcards
+    # changes run serially in one transaction rather than on parallel
+    # connections. BEGIN IMMEDIATE waits up to the busy timeout for a running
+    # app to release the write lock instead of failing straight away.
+    conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_SECONDS)
     cursor = conn.cursor()
+    ddl_parts = []
 
     try:
-        print("\n🔄 Starting AI fields migration...\n")
-
-        # ============================================================
-        # 1. ADD AI FIELDS TO USERS TABLE
-        # ============================================================
-        print("1️⃣  Adding AI fields to 'users' table...")
-
-        # Check if columns already exist
-        cursor.execute("PRAGMA table_info(users)")
-        existing_columns = [column[1] for column in cursor.fetchall()]
+        user_version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if user_version & AI_FIELDS_MIGRATED:
+            log.info("✅ AI fields migration already applied - no changes needed!")
+            return True
 
-        changes_made = False
-
-        if "ai_enabled" not in existing_columns:
-            cursor.execute("""
-                ALTER TABLE users 
-                ADD COLUMN ai_enabled BOOLEAN NOT NULL DEFAULT 0
-            """)
-            print("   ✓ Added 'ai_enabled' column")
-            changes_made = True
-        else:
-            print("   ⏭  'ai_enabled' column already exists")
-
-        if "ai_credits" not in existing_columns:
-            cursor.execute("""
-                ALTER TABLE users 
-                ADD COLUMN ai_credits INTEGER DEFAULT 100
-            """)
-            print("   ✓ Added 'ai_credits' column")
-            changes_made = True
-        else:
-            print("   ⏭  'ai_credits' column already exists")
-
-        if "ai_provider" not in existing_columns:
-            cursor.execute("""
-                ALTER TABLE users 
-                ADD COLUMN ai_provider VARCHAR(20) DEFAULT 'gemini'
-            """)
-            print("   ✓ Added 'ai_provider' column")
-            changes_made = True
-        else:
-            print("   ⏭  'ai_provider' column already exists")
+        log.info("🔄 Starting AI fields migration...")
 
         # ============================================================
-        # 2. ADD AI FIELDS TO FLASHCARDS TABLE
+        # 1-2. ADD AI FIELDS TO USERS AND FLASHCARDS TABLES
         # ============================================================
-        print("\n2️⃣  Adding AI fields to 'flashcards' table...")
-
-        cursor.execute("PRAGMA table_info(flashcards)")
-        existing_columns = [column[1] for column in cursor.fetchall()]
+        schema = introspect(conn, refresh=True)
 
-        if "ai_generated" not in existing_columns:
-            cursor.execute("""
-                ALTER TABLE flashcards 
-                ADD COLUMN ai_generated BOOLEAN NOT NULL DEFAULT 0
-            """)
-            print("   ✓ Added 'ai_generated' column")
-            changes_made = True
-        else:
-            print("   ⏭  'ai_generated' column already exists")
-
-        if "generation_prompt" not in existing_columns:
-            cursor.execute("""
-                ALTER TABLE flashcards 
-                ADD COLUMN generation_prompt TEXT
-            """)
-            print("   ✓ Added 'generation_prompt' column")
-            changes_made = True
-        else:
-            print("   ⏭  'generation_prompt' column already exists")
-
-        if "ai_provider" not in existing_columns:
-            cursor.execute("""
-                ALTER TABLE flashcards 
-                ADD COLUMN ai_provider VARCHAR(20)
-            """)
-            print("   ✓ Added 'ai_provider' column to flashcards")
-            changes_made = True
-        else:
-            print("   ⏭  'ai_provider' column already exists in flashcards")
+        changes_made = False
+        current_table = None
+
+        for table, column, _ in MIGRATIONS:
+            if table != current_table:
+                current_table = table
+                if table in schema["tables"]:
+                    log.info("➕ Adding AI fields to '%s' table...", table)
+                else:
+                    # Fresh install: db.create_all() will create this table
+                    # from the models with every AI column already in place
+                    log.info("⏭  '%s' table not created yet - skipping its columns", table)
+
+            if table not in schema["tables"]:
+                continue
+
+            if column not in schema["columns"][table]:
+                ddl_parts.append(COLUMN_DDL[(table, column)])
+                log.info("   ✓ Added '%s' column to %s", column, table)
+                changes_made = True
+            else:
+                log.info("   ⏭  '%s' column already exists in %s", column, table)
 
         # ============================================================
         # 3. CREATE AI_USAGE_LOGS TABLE
         # ============================================================
-        print("\n3️⃣  Creating 'ai_usage_logs' table...")
-
-        # Check if table exists
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='ai_usage_logs'
-        """)
-
-        if not cursor.fetchone():
-            cursor.execute("""
-                CREATE TABLE ai_usage_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    operation_type VARCHAR(50) NOT NULL,
-                    tokens_used INTEGER DEFAULT 0,
-                    cost DECIMAL(10, 6) DEFAULT 0.0,
-                    success BOOLEAN DEFAULT 1,
-                    error_message TEXT,
-                    request_data TEXT,
-                    response_data TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (user_id) REFERENCES users(id)
-                )
-            """)
-            print("   ✓ Created 'ai_usage_logs' table")
+        log.info("3️⃣  Creating 'ai_usage_logs' table...")
+
+        if "ai_usage_logs" not in schema["tables"]:
+            ddl_parts.append(AI_USAGE_LOGS_DDL)
+            log.info("   ✓ Created 'ai_usage_logs' table")
             changes_made = True
         else:
-            print("   ⏭  'ai_usage_logs' table already exists")
+            log.info("   ⏭  'ai_usage_logs' table already exists")
 
         # ============================================================
         # 4. CREATE INDEXES FOR PERFORMANCE
         # ============================================================
-        print("\n4️⃣  Creating indexes for AI tables...")
-
-        # Check existing indexes
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
-        existing_indexes = [row[0] for row in cursor.fetchall()]
-
-        if "idx_ai_usage_user_id" not in existing_indexes:
-            cursor.execute("""
-                CREATE INDEX idx_ai_usage_user_id 
-                ON ai_usage_logs(user_id)
-            """)
-            print("   ✓ Created index on ai_usage_logs.user_id")
-            changes_made = True
-        else:
-            print("   ⏭  Index idx_ai_usage_user_id already exists")
-
-        if "idx_ai_usage_created_at" not in existing_indexes:
-            cursor.execute("""
-                CREATE INDEX idx_ai_usage_created_at 
-                ON ai_usage_logs(created_at)
-            """)
-            print("   ✓ Created index on ai_usage_logs.created_at")
-            changes_made = True
-        else:
-            print("   ⏭  Index idx_ai_usage_created_at already exists")
-
-        if "idx_flashcards_ai_generated" not in existing_indexes:
-            cursor.execute("""
-                CREATE INDEX idx_flashcards_ai_generated 
-                ON flashcards(ai_generated)
-            """)
-            print("   ✓ Created index on flashcards.ai_generated")
-            changes_made = True
-        else:
-            print("   ⏭  Index idx_flashcards_ai_generated already exists")
+        log.info("4️⃣  Creating indexes for AI tables...")
+
+        existing_indexes = schema["indexes"]
+
+        created_tables = schema["tables"] | {"ai_usage_logs"}
+
+        for index_name, (table, ddl) in INDEX_DDL.items():
+            if table not in created_tables:
+                log.info("   ⏭  Index %s skipped ('%s' not created yet)", index_name, table)
+            elif index_name not in existing_indexes:
+                ddl_parts.append(ddl)
+                log.info("   ✓ Created index %s", index_name)
+                changes_made = True
+            else:
+                log.info("   ⏭  Index %s already exists", index_name)
+
+        for index_name in OBSOLETE_INDEXES:
+            if index_name in existing_indexes:
+                ddl_parts.append(f"DROP INDEX {index_name}")
+                log.info("   ✓ Dropped superseded index %s", index_name)
+                changes_made = True
 
         # ============================================================
         # 5. COMMIT CHANGES
         # ============================================================
+        # Set this migration's bit in the same transaction as the DDL, unless
+        # tables were skipped on a fresh install and need another pass later
+        if all(table in schema["tables"] for table, _, _ in MIGRATIONS):
+            ddl_parts.append(f"PRAGMA user_version = {user_version | AI_FIELDS_MIGRATED}")
+
+        # Run every queued DDL statement as one script inside a single
+        # transaction. The rollback journal is kept in memory for the
+        # migration window (so a failed statement can still roll back)
+        # and the original journal and sync modes are restored afterwards,
+        # whether or not the batch succeeded.
+        journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        synchronous = cursor.execute("PRAGMA synchronous").fetchone()[0]
+        conn.executescript("PRAGMA journal_mode=MEMORY; PRAGMA synchronous=OFF;")
+        try:
+            conn.executescript(
+                "BEGIN IMMEDIATE;\n" + ";\n".join(ddl_parts) + ";\nCOMMIT;"
+            )
+        finally:
+            # A failed script leaves its transaction open; roll it back first,
+            # or the PRAGMA script below would commit the partial batch
+            if conn.in_transaction:
+                conn.rollback()
+            conn.executescript(
+                f"PRAGMA journal_mode={journal_mode}; PRAGMA synchronous={synchronous};"
+            )
+
         if changes_made:
-            conn.commit()
-            print("\n✅ AI fields migration completed successfully!")
+            log.info("✅ AI fields migration completed successfully!")
         else:
-            print("\n✅ All AI fields already exist - no changes needed!")
+            log.info("✅ All AI fields already exist - no changes needed!")
 
         # ============================================================
         # 6. VERIFY CHANGES
         # ============================================================
-        print("\n🔍 Verifying database structure...")
-
-        # Check users table
-        cursor.execute("PRAGMA table_info(users)")
-        user_columns = [col[1] for col in cursor.fetchall()]
-        ai_user_fields = ["ai_enabled", "ai_credits", "ai_provider"]
         all_good = True
 
-        for field in ai_user_fields:
-            if field in user_columns:
-                print(f"   ✓ users.{field} exists")
-            else:
-                print(f"   ❌ users.{field} missing!")
-                all_good = False
+        if verify:
+            log.info("🔍 Verifying database structure...")
 
-        # Check flashcards table
-        cursor.execute("PRAGMA table_info(flashcards)")
-        card_columns = [col[1] for col in cursor.fetchall()]
-        ai_card_fields = ["ai_generated", "generation_prompt", "ai_provider"]
+            schema = introspect(conn, refresh=changes_made)
 
-        for field in ai_card_fields:
-            if field in card_columns:
-                print(f"   ✓ flashcards.{field} exists")
+            # Check AI columns
+            for table, column, _ in MIGRATIONS:
+                if table not in schema["tables"]:
+                    log.info("   ⏭  %s.%s left to db.create_all()", table, column)
+                elif column in schema["columns"][table]:
+                    log.info("   ✓ %s.%s exists", table, column)
+                else:
+                    log.error("   ❌ %s.%s missing!", table, column)
+                    all_good = False
+
+            # Check ai_usage_logs table
+            if "ai_usage_logs" in schema["tables"]:
+                log.info("   ✓ ai_usage_logs table exists")
             else:
-                print(f"   ❌ flashcards.{field} missing!")
+                log.error("   ❌ ai_usage_logs table missing!")
                 all_good = False
 
-        # Check ai_usage_logs table
-        cursor.execute("""
-            SELECT name FROM sqlite_master 
-            WHERE type='table' AND name='ai_usage_logs'
-        """)
-        if cursor.fetchone():
-            print("   ✓ ai_usage_logs table exists")
-        else:
-            print("   ❌ ai_usage_logs table missing!")
-            all_good = False
-
         if all_good:
             print("\n" + "=" * 60)
             print("🎉 Migration complete! Your database is ready for AI features.")
@@ -252,8 +295,22 @@ def migrate_database(db_path):
 
         return all_good
 
+    except sqlite3.OperationalError as e:
+        log.error(
+            "❌ DDL failed: %s\n   Statements in the failed batch:\n%s",
+            e,
+            "\n".join(f"   - {' '.join(statement.split())}" for statement in ddl_parts),
+        )
+        conn.rollback()
+        return False
+
+    except sqlite3.IntegrityError as e:
+        log.error("❌ Constraint violation: %s", e)
+        conn.rollback()
+        return False
+
     except sqlite3.Error as e:
-        print(f"\n❌ Database error: {e}")
+        log.error("❌ Database error: %s", e)
         conn.rollback()
         return False
 
@@ -262,6 +319,20 @@ def migrate_database(db_path):
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add AI feature fields to the database")
+    parser.add_argument(
+        "--yes", "-y", action="store_true", help="skip the confirmation prompt"
+    )
+    parser.add_argument(
+        "--verify", action="store_true", help="re-read the schema after migrating"
+    )
+    args = parser.parse_args()
+
+    # Step messages are logged at INFO; set MIGRATE_LOG=INFO to see them
+    logging.basicConfig(
+        level=os.environ.get("MIGRATE_LOG", "WARNING").upper(), format="%(message)s"
+    )
+
     print("=" * 60)
     print("AI FEATURES DATABASE MIGRATION")
     print("=" * 60)
@@ -280,10 +351,15 @@ if __name__ == "__main__":
         print("Please ensure your Flask app has created the database first.")
         sys.exit(1)
 
-    response = input("\nProceed with migration? (yes/no): ").strip().lower()
+    # Only prompt when a person is at the terminal; CI and container
+    # entrypoints (no TTY on stdin) proceed as if --yes was given
+    if args.yes or not sys.stdin.isatty():
+        response = "yes"
+    else:
+        response = input("\nProceed with migration? (yes/no): ").strip().lower()
 
     if response in ["yes", "y"]:
-        success = migrate_database(db_path)
+        success = migrate_database(db_path, verify=args.verify)
         if success:
             print("\n✅ You can now use AI features in your application!")
         else:
@@ -2,8 +2,13 @@
 """
 Migration Script: Add document fields to mc_cards table
 Run this script from the project root directory
+
+Usage:
+    python add_document_fields_migration.py               # add the columns
+    python add_document_fields_migration.py --rollback    # remove them again
 """
 
+import argparse
 import sys
 import os
 
@@ -14,6 +19,29 @@ from app import create_app
 from app.extensions import db
 from sqlalchemy import text
 
+# Bit set in PRAGMA user_version once this migration has run. Each migration
+# script owns one bit, so they can run in any order without one marking
+# another as done. Bits 0-7 held an earlier shared version number and are
+# ignored.
+DOCUMENT_FIELDS_MIGRATED = 1 << 10
+
+
+def get_schema_version():
+    """Return the SQLite user_version, or None on other database backends"""
+    if db.engine.dialect.name != 'sqlite':
+        return None
+    with db.engine.connect() as conn:
+        return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def set_schema_version(version):
+    """Set the SQLite user_version (no-op on other database backends)"""
+    if db.engine.dialect.name != 'sqlite':
+        return
+    with db.engine.begin() as conn:
+        conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+
 def run_migration():
     """Add document_id and document_section columns to mc_cards table"""
 
@@ -24,9 +52,15 @@ def run_migration():
         print("-" * 60)
 
         try:
-            # Check if columns already exist
+            schema_version = get_schema_version()
+            if schema_version is not None and schema_version & DOCUMENT_FIELDS_MIGRATED:
+                print("✓ Document fields migration already applied. No migration needed.")
+                return True
+
+            # Check if columns already exist (reflected once; the result is
+            # reused for verification below)
             inspector = db.inspect(db.engine)
-            existing_columns = [col['name'] for col in inspector.get_columns('mc_cards')]
+            existing_columns = {col['name'] for col in inspector.get_columns('mc_cards')}
 
             columns_to_add = []
 
@@ -41,42 +75,75 @@ def run_migration():
                 print("✓ Column 'document_section' already exists")
 
             if not columns_to_add:
-                print("\n✓ All columns already exist. No migration needed.")
-                return True
+                print("\n✓ All columns already exist. Checking indexes only.")
+            else:
+                # Add missing columns
+                print(f"\nAdding columns: {', '.join(columns_to_add)}")
 
-            # Add missing columns
-            print(f"\nAdding columns: {', '.join(columns_to_add)}")
+            ddl_list = []
 
             if 'document_id' in columns_to_add:
-                print("  Adding document_id column...")
-                db.session.execute(text("""
+                ddl_list.append("""
                     ALTER TABLE mc_cards
                     ADD COLUMN document_id INTEGER
                     REFERENCES documents(id) ON DELETE CASCADE
-                """))
-                print("  ✓ document_id column added")
+                """)
 
             if 'document_section' in columns_to_add:
-                print("  Adding document_section column...")
-                db.session.execute(text("""
+                ddl_list.append("""
                     ALTER TABLE mc_cards
                     ADD COLUMN document_section VARCHAR(200)
-                """))
-                print("  ✓ document_section column added")
+                """)
+
+            # Run all ALTERs in one transaction so they commit (or fail) together
+            with db.engine.connect() as conn:
+                sqlite_fast_path = db.engine.dialect.name == 'sqlite'
+
+                if sqlite_fast_path:
+                    # Keep the rollback journal in memory for the migration window
+                    journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+                    conn.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+                    conn.commit()
+
+                try:
+                    with conn.begin():
+                        if sqlite_fast_path:
+                            # pysqlite does not open a transaction for DDL by itself
+                            conn.exec_driver_sql("BEGIN")
+                        for column, ddl in zip(columns_to_add, ddl_list):
+                            print(f"  Adding {column} column...")
+                            conn.exec_driver_sql(ddl)
+                            print(f"  ✓ {column} column added")
+
+                        # SQLite does not index foreign key columns on its own.
+                        # Most cards have no document, so the partial index
+                        # stays small while serving both document lookups and
+                        # the ON DELETE CASCADE scan.
+                        print("  Creating index on (document_id, document_section)...")
+                        conn.exec_driver_sql("""
+                            CREATE INDEX IF NOT EXISTS idx_mc_cards_document
+                            ON mc_cards(document_id, document_section)
+                            WHERE document_id IS NOT NULL
+                        """)
+                        print("  ✓ idx_mc_cards_document index ready")
+                finally:
+                    if sqlite_fast_path:
+                        conn.exec_driver_sql(f"PRAGMA journal_mode={journal_mode}")
+                        conn.commit()
 
-            # Commit changes
-            db.session.commit()
             print("\n" + "=" * 60)
             print("✓ Migration completed successfully!")
             print("=" * 60)
 
-            # Verify the migration
+            # Verify the migration against the reflected columns plus the ones
+            # just added, rather than reflecting the table a second time
             print("\nVerifying migration...")
-            inspector = db.inspect(db.engine)
-            columns_after = [col['name'] for col in inspector.get_columns('mc_cards')]
+            columns_after = existing_columns | set(columns_to_add)
 
             if 'document_id' in columns_after and 'document_section' in columns_after:
                 print("✓ Verification passed: All columns present")
+                if schema_version is not None:
+                    set_schema_version(schema_version | DOCUMENT_FIELDS_MIGRATED)
                 return True
             else:
                 print("✗ Verification failed: Columns not found")
@@ -91,6 +158,68 @@ def run_migration():
             return False
 
 
+def rebuild_sqlite_table_without(table, columns_to_remove):
+    """Recreate a SQLite table without the given columns, copying rows once
+
+    The new table is built from the live schema (PRAGMA table_info and
+    foreign_key_list), filled with a single INSERT ... SELECT, swapped in with
+    DROP + RENAME, and then the surviving indexes and triggers are recreated.
+    """
+    new_table = f"{table}_new"
+
+    with db.engine.connect() as conn:
+        columns = conn.exec_driver_sql(f"PRAGMA table_info({table})").fetchall()
+        foreign_keys = conn.exec_driver_sql(f"PRAGMA foreign_key_list({table})").fetchall()
+        # Capture index/trigger DDL before the DROP discards it
+        dependents = conn.exec_driver_sql(
+            "SELECT sql FROM sqlite_master "
+            "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+            (table,)
+        ).fetchall()
+        conn.commit()
+
+        keep = [col for col in columns if col[1] not in columns_to_remove]
+        column_defs = []
+        for _, name, col_type, not_null, default, _ in keep:
+            column_def = f'"{name}" {col_type}'
+            if not_null:
+                column_def += " NOT NULL"
+            if default is not None:
+                column_def += f" DEFAULT {default}"
+            column_defs.append(column_def)
+
+        primary_key = [col[1] for col in sorted(keep, key=lambda col: col[5]) if col[5]]
+        if primary_key:
+            column_defs.append(f"PRIMARY KEY ({', '.join(primary_key)})")
+
+        for fk in foreign_keys:
+            _, _, ref_table, from_col, to_col, on_update, on_delete, _ = fk
+            if from_col in columns_to_remove:
+                continue
+            fk_def = f"FOREIGN KEY ({from_col}) REFERENCES {ref_table} ({to_col})"
+            if on_update != 'NO ACTION':
+                fk_def += f" ON UPDATE {on_update}"
+            if on_delete != 'NO ACTION':
+                fk_def += f" ON DELETE {on_delete}"
+            column_defs.append(fk_def)
+
+        kept_names = ", ".join(f'"{col[1]}"' for col in keep)
+
+        with conn.begin():
+            # pysqlite does not open a transaction for DDL by itself
+            conn.exec_driver_sql("BEGIN")
+            conn.exec_driver_sql(f"CREATE TABLE {new_table} ({', '.join(column_defs)})")
+            conn.exec_driver_sql(
+                f"INSERT INTO {new_table} ({kept_names}) SELECT {kept_names} FROM {table}"
+            )
+            conn.exec_driver_sql(f"DROP TABLE {table}")
+            conn.exec_driver_sql(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+            for (sql,) in dependents:
+                if not any(column in sql for column in columns_to_remove):
+                    conn.exec_driver_sql(sql)
+
+
 def rollback_migration():
     """Remove document fields from mc_cards table (rollback)"""
 
@@ -103,7 +232,7 @@ def rollback_migration():
         try:
             # Check if columns exist
             inspector = db.inspect(db.engine)
-            existing_columns = [col['name'] for col in inspector.get_columns('mc_cards')]
+            existing_columns = {col['name'] for col in inspector.get_columns('mc_cards')}
 
             columns_to_remove = []
 
@@ -119,74 +248,72 @@ def rollback_migration():
 
             print(f"\nRemoving columns: {', '.join(columns_to_remove)}")
 
-            # SQLite doesn't support DROP COLUMN directly in older versions
-            # We'll need to check the database type
-            db_type = db.engine.dialect.name
+            if db.engine.dialect.name == 'sqlite':
+                # Rebuild the table once instead of relying on DROP COLUMN
+                # (SQLite 3.35+ only, and it refuses to drop FK columns)
+                print("\nSQLite detected. Rebuilding mc_cards without the document columns...")
+                rebuild_sqlite_table_without('mc_cards', columns_to_remove)
+                print("  ✓ mc_cards rebuilt")
+            else:
+                db.session.execute(text("DROP INDEX IF EXISTS idx_mc_cards_document"))
 
-            if db_type == 'sqlite':
-                print("\nNote: SQLite detected. This may require recreating the table.")
-                print("Consider using Flask-Migrate for proper SQLite migrations.")
-                print("Attempting column drop (requires SQLite 3.35.0+)...")
+                for column in columns_to_remove:
+                    print(f"  Removing {column} column...")
+                    db.session.execute(text(f"ALTER TABLE mc_cards DROP COLUMN {column}"))
+                    print(f"  ✓ {column} column removed")
 
-            if 'document_id' in columns_to_remove:
-                print("  Removing document_id column...")
-                db.session.execute(text("ALTER TABLE mc_cards DROP COLUMN document_id"))
-                print("  ✓ document_id column removed")
+                db.session.commit()
 
-            if 'document_section' in columns_to_remove:
-                print("  Removing document_section column...")
-                db.session.execute(text("ALTER TABLE mc_cards DROP COLUMN document_section"))
-                print("  ✓ document_section column removed")
+            # Clear this migration's bit so it can be applied again
+            schema_version = get_schema_version()
+            if schema_version is not None:
+                set_schema_version(schema_version & ~DOCUMENT_FIELDS_MIGRATED)
 
-            db.session.commit()
             print("\n✓ Rollback completed successfully!")
             return True
 
         except Exception as e:
             db.session.rollback()
             print(f"\n✗ Rollback failed: {str(e)}")
-            print("\nIf using SQLite < 3.35.0, you may need to:")
-            print("1. Export your data")
-            print("2. Drop and recreate the mc_cards table")
-            print("3. Re-import your data")
             return False
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description="Add document_id and document_section columns to mc_cards"
+    )
+    parser.add_argument(
+        '--rollback', action='store_true', help="remove the columns instead of adding them"
+    )
+    parser.add_argument(
+        '--yes', '-y', action='store_true', help="skip the rollback confirmation prompt"
+    )
+    args = parser.parse_args()
+
     print("\n" + "=" * 60)
     print("MC Cards Document Fields Migration")
     print("=" * 60)
-    print("\nThis script will add document_id and document_section columns")
-    print("to the mc_cards table for Phase 3 implementation.")
-    print("\nOptions:")
-    print("  1. Run migration (add columns)")
-    print("  2. Rollback migration (remove columns)")
-    print("  3. Exit")
-    print("-" * 60)
-
-    choice = input("\nEnter your choice (1-3): ").strip()
 
-    if choice == '1':
+    if not args.rollback:
+        print("\nAdding document_id and document_section columns to mc_cards")
+        print("for Phase 3 implementation.")
         print("\n" + "=" * 60)
         success = run_migration()
         print("=" * 60)
         sys.exit(0 if success else 1)
 
-    elif choice == '2':
+    # Only prompt when a person is at the terminal; CI and container
+    # entrypoints (no TTY on stdin) proceed as if --yes was given
+    if args.yes or not sys.stdin.isatty():
+        confirm = 'yes'
+    else:
         confirm = input("\nAre you sure you want to rollback? (yes/no): ").strip().lower()
-        if confirm == 'yes':
-            print("\n" + "=" * 60)
-            success = rollback_migration()
-            print("=" * 60)
-            sys.exit(0 if success else 1)
-        else:
-            print("Rollback cancelled.")
-            sys.exit(0)
-
-    elif choice == '3':
-        print("Exiting...")
-        sys.exit(0)
 
+    if confirm in ('yes', 'y'):
+        print("\n" + "=" * 60)
+        success = rollback_migration()
+        print("=" * 60)
+        sys.exit(0 if success else 1)
     else:
-        print("Invalid choice. Exiting...")
-        sys.exit(1)
+        print("Rollback cancelled.")
+        sys.exit(0)
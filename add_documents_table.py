@@ -6,12 +6,13 @@ Run this script from the project root: python add_documents_table.py
 import os
 import sys
 from datetime import datetime
+from pathlib import Path
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from app import create_app, db
-from sqlalchemy import inspect, text
+from sqlalchemy import inspect
 
 
 def table_exists(table_name):
@@ -29,32 +30,39 @@ def add_documents_table():
 
     print("Creating 'documents' table...")
 
-    # Create documents table
-    db.engine.execute(text("""
-        CREATE TABLE documents (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            filename VARCHAR(255) NOT NULL,
-            original_filename VARCHAR(255) NOT NULL,
-            file_path VARCHAR(500) NOT NULL,
-            file_type VARCHAR(20) NOT NULL,
-            file_size INTEGER NOT NULL,
-            gemini_file_uri VARCHAR(500),
-            gemini_file_name VARCHAR(255),
-            gemini_expires_at DATETIME,
-            upload_date DATETIME NOT NULL,
-            last_accessed DATETIME,
-            processing_status VARCHAR(20) NOT NULL DEFAULT 'pending',
-            error_message TEXT,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
-        )
-    """))
-
-    # Create indexes for better query performance
-    print("Creating indexes...")
-    db.engine.execute(text("CREATE INDEX idx_documents_user_id ON documents(user_id)"))
-    db.engine.execute(text("CREATE INDEX idx_documents_processing_status ON documents(processing_status)"))
-    db.engine.execute(text("CREATE INDEX idx_documents_upload_date ON documents(upload_date DESC)"))
+    # pysqlite runs one statement per call, so the DDL is issued statement by
+    # statement, but on one connection and in a single transaction
+    with db.engine.connect() as conn, conn.begin():
+        if conn.dialect.name == 'sqlite':
+            # pysqlite does not open a transaction for DDL by itself
+            conn.exec_driver_sql("BEGIN")
+
+        # Create documents table
+        conn.exec_driver_sql("""
+            CREATE TABLE documents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                filename VARCHAR(255) NOT NULL,
+                original_filename VARCHAR(255) NOT NULL,
+                file_path VARCHAR(500) NOT NULL,
+                file_type VARCHAR(20) NOT NULL,
+                file_size INTEGER NOT NULL,
+                gemini_file_uri VARCHAR(500),
+                gemini_file_name VARCHAR(255),
+                gemini_expires_at DATETIME,
+                upload_date DATETIME NOT NULL,
+                last_accessed DATETIME,
+                processing_status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                error_message TEXT,
+                FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+            )
+        """)
+
+        # Create indexes for better query performance
+        print("Creating indexes...")
+        conn.exec_driver_sql("CREATE INDEX idx_documents_user_id ON documents(user_id)")
+        conn.exec_driver_sql("CREATE INDEX idx_documents_processing_status ON documents(processing_status)")
+        conn.exec_driver_sql("CREATE INDEX idx_documents_upload_date ON documents(upload_date DESC)")
 
     print("✓ 'documents' table created successfully!")
     return True
@@ -62,24 +70,29 @@ def add_documents_table():
 
 def verify_migration():
     """Verify the migration was successful"""
-    inspector = inspect(db.engine)
+    with db.engine.connect() as conn:
+        columns = frozenset(
+            row[0] for row in conn.exec_driver_sql(
+                "SELECT name FROM pragma_table_info('documents')"
+            )
+        )
 
-    if not table_exists('documents'):
+    # pragma_table_info yields no rows for a missing table
+    if not columns:
         print("✗ Migration failed: 'documents' table not found")
         return False
 
-    columns = [col['name'] for col in inspector.get_columns('documents')]
-    expected_columns = [
+    expected_columns = frozenset({
         'id', 'user_id', 'filename', 'original_filename', 'file_path',
         'file_type', 'file_size', 'gemini_file_uri', 'gemini_file_name',
         'gemini_expires_at', 'upload_date', 'last_accessed',
         'processing_status', 'error_message'
-    ]
+    })
 
-    missing_columns = [col for col in expected_columns if col not in columns]
+    missing_columns = expected_columns - columns
 
     if missing_columns:
-        print(f"✗ Migration verification failed: Missing columns: {missing_columns}")
+        print(f"✗ Migration verification failed: Missing columns: {sorted(missing_columns)}")
         return False
 
     print("✓ Migration verification passed!")
@@ -92,23 +105,18 @@ def verify_migration():
 
 def create_uploads_directory():
     """Create the uploads/documents directory if it doesn't exist"""
-    uploads_dir = os.path.join(os.path.dirname(__file__), 'uploads', 'documents')
-
-    if os.path.exists(uploads_dir):
-        print(f"✓ Uploads directory already exists: {uploads_dir}")
-        return
+    uploads_dir = Path(__file__).resolve().parent / 'uploads' / 'documents'
 
     try:
-        os.makedirs(uploads_dir, exist_ok=True)
-        print(f"✓ Created uploads directory: {uploads_dir}")
+        # exist_ok makes a separate existence check unnecessary
+        uploads_dir.mkdir(parents=True, exist_ok=True)
+        print(f"✓ Uploads directory ready: {uploads_dir}")
 
         # Create a .gitkeep file to track the directory in git
-        gitkeep_path = os.path.join(uploads_dir, '.gitkeep')
-        with open(gitkeep_path, 'w') as f:
-            f.write('')
-        print(f"✓ Created .gitkeep file")
+        (uploads_dir / '.gitkeep').touch(exist_ok=True)
+        print(f"✓ .gitkeep file ready")
 
-    except Exception as e:
+    except OSError as e:
         print(f"✗ Failed to create uploads directory: {e}")
 
 
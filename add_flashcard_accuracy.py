@@ -0,0 +1,95 @@
+"""
+Migration script to add the database-computed flashcards.accuracy column and
+its (deck_id, accuracy) index, used to filter and sort the card list
+Run this script from the project root: python add_flashcard_accuracy.py
+Set MIGRATE_LOG=INFO to see step-by-step progress.
+
+Databases created by db.create_all() already have the column and index.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app, db
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+
+log = logging.getLogger("migrate")
+
+ACCURACY_EXPR = (
+    "CASE WHEN times_studied > 0 THEN times_correct * 100.0 / times_studied ELSE 0 END"
+)
+
+# SQLite can only add VIRTUAL generated columns to an existing table; it
+# computes them on read, and the index still stores the values
+ADD_COLUMN_DDL = {
+    "sqlite": f"ALTER TABLE flashcards ADD COLUMN accuracy REAL GENERATED ALWAYS AS ({ACCURACY_EXPR}) VIRTUAL",
+    "postgresql": (
+        "ALTER TABLE flashcards ADD COLUMN IF NOT EXISTS accuracy double precision "
+        f"GENERATED ALWAYS AS ({ACCURACY_EXPR}) STORED"
+    ),
+}
+
+INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS idx_flashcards_deck_accuracy "
+    "ON flashcards(deck_id, accuracy)"
+)
+
+
+def main():
+    """Add the accuracy column and index in one transaction"""
+    print("=" * 60)
+    print("Flashcard Accuracy Column Migration")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn, conn.begin():
+                dialect = conn.dialect.name
+                if dialect not in ADD_COLUMN_DDL:
+                    log.error("✗ Unsupported database: %s", dialect)
+                    sys.exit(1)
+
+                if dialect == "sqlite":
+                    # pysqlite does not open a transaction for DDL by itself
+                    conn.exec_driver_sql("BEGIN")
+
+                columns = {c["name"] for c in inspect(conn).get_columns("flashcards")}
+                if "accuracy" in columns:
+                    log.info("flashcards.accuracy already exists, skipped")
+                else:
+                    log.info("Adding flashcards.accuracy...")
+                    conn.exec_driver_sql(ADD_COLUMN_DDL[dialect])
+
+                log.info("Creating idx_flashcards_deck_accuracy...")
+                conn.exec_driver_sql(INDEX_DDL)
+
+            print("✓ flashcards.accuracy and its index are in place")
+            print("=" * 60)
+
+        except OperationalError as e:
+            log.error(
+                "✗ DDL statement failed:\n  %s\n  Statement: %s",
+                e.orig,
+                " ".join(e.statement.split()),
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the computed flashcards.accuracy column")
+    parser.parse_args()
+
+    # Step messages are logged at INFO; set MIGRATE_LOG=INFO to see them
+    logging.basicConfig(
+        level=os.environ.get("MIGRATE_LOG", "WARNING").upper(), format="%(message)s"
+    )
+
+    main()
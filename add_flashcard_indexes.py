@@ -0,0 +1,111 @@
+"""
+Migration script to add the composite flashcard indexes used by deck statistics,
+study queues and the card list, plus trigram indexes for card text search on PostgreSQL
+Run this script from the project root: python add_flashcard_indexes.py
+Set MIGRATE_LOG=INFO to see step-by-step progress.
+
+Databases created by db.create_all() already have these indexes; the
+ai_usage_logs and chat_messages indexes come from add_ai_fields.py and
+add_chat_tables.py.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app, db
+from sqlalchemy.exc import OperationalError
+
+log = logging.getLogger("migrate")
+
+
+# Index name -> CREATE INDEX statement. All lead with deck_id, so every
+# per-deck query seeks straight to that deck's cards.
+INDEX_DDL = {
+    # get_cards_statistics() and get_cards_by_state() count per learning state
+    "idx_flashcards_deck_state": (
+        "CREATE INDEX IF NOT EXISTS idx_flashcards_deck_state "
+        "ON flashcards(deck_id, learning_state)"
+    ),
+    # Due-card queues range-scan next_review_date within a deck
+    "idx_flashcards_deck_review": (
+        "CREATE INDEX IF NOT EXISTS idx_flashcards_deck_review "
+        "ON flashcards(deck_id, next_review_date)"
+    ),
+    # Deck.search_cards() defaults to newest first and filters on a date range
+    "idx_flashcards_deck_created": (
+        "CREATE INDEX IF NOT EXISTS idx_flashcards_deck_created "
+        "ON flashcards(deck_id, created_at)"
+    ),
+    # The card list's difficulty sorts order by ease_factor
+    "idx_flashcards_deck_ease": (
+        "CREATE INDEX IF NOT EXISTS idx_flashcards_deck_ease "
+        "ON flashcards(deck_id, ease_factor)"
+    ),
+}
+
+# PostgreSQL only: trigram GIN indexes let the ILIKE '%term%' card search use
+# an index instead of scanning every card. SQLite has no equivalent for
+# substring LIKE, so it keeps scanning the deck's rows.
+POSTGRES_SEARCH_DDL = {
+    "pg_trgm": "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "idx_flashcards_front_trgm": (
+        "CREATE INDEX IF NOT EXISTS idx_flashcards_front_trgm "
+        "ON flashcards USING gin (front_text gin_trgm_ops)"
+    ),
+    "idx_flashcards_back_trgm": (
+        "CREATE INDEX IF NOT EXISTS idx_flashcards_back_trgm "
+        "ON flashcards USING gin (back_text gin_trgm_ops)"
+    ),
+}
+
+
+def main():
+    """Create any missing flashcard indexes in one transaction"""
+    print("=" * 60)
+    print("Flashcard Index Migration")
+    print("=" * 60)
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            with db.engine.connect() as conn, conn.begin():
+                if conn.dialect.name == "sqlite":
+                    # pysqlite does not open a transaction for DDL by itself
+                    conn.exec_driver_sql("BEGIN")
+
+                statements = dict(INDEX_DDL)
+                if conn.dialect.name == "postgresql":
+                    statements.update(POSTGRES_SEARCH_DDL)
+
+                for index_name, ddl in statements.items():
+                    log.info("Creating %s...", index_name)
+                    conn.exec_driver_sql(ddl)
+
+            print(f"✓ {len(statements)} flashcard index statements applied")
+            print("=" * 60)
+
+        except OperationalError as e:
+            log.error(
+                "✗ DDL statement failed:\n  %s\n  Statement: %s",
+                e.orig,
+                " ".join(e.statement.split()),
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add the composite flashcard indexes")
+    parser.parse_args()
+
+    # Step messages are logged at INFO; set MIGRATE_LOG=INFO to see them
+    logging.basicConfig(
+        level=os.environ.get("MIGRATE_LOG", "WARNING").upper(), format="%(message)s"
+    )
+
+    main()
@@ -4,7 +4,6 @@ Run this directly: python add_sm2_fields.py
 """
 
 import sqlite3
-from datetime import datetime
 import os
 
 # Database path
@@ -25,6 +24,12 @@ def run_migration():
         # Connect to database
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
+
+        # Tune the connection for one bulk write; the whole migration
+        # (ALTERs + UPDATE) then runs in a single transaction
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-65536")
         
         print("\n🔄 Adding SM-2 fields to flashcards table...")
         
@@ -38,31 +43,37 @@ def run_migration():
             ("learning_state", "VARCHAR(20) DEFAULT 'new'")
         ]
         
-        for column_name, column_type in columns_to_add:
-            try:
-                cursor.execute(f"ALTER TABLE flashcards ADD COLUMN {column_name} {column_type}")
-                print(f"   ✓ Added column: {column_name}")
-            except sqlite3.OperationalError as e:
-                if "duplicate column" in str(e).lower():
-                    print(f"   ⚠️  Column {column_name} already exists, skipping...")
-                else:
-                    raise
+        existing = {row[1] for row in cursor.execute("PRAGMA table_info(flashcards)").fetchall()}
+
+        missing_columns = [name for name, _ in columns_to_add if name not in existing]
+        definitions = dict(columns_to_add)
+        statements = [
+            f"ALTER TABLE flashcards ADD COLUMN {name} {definitions[name]}"
+            for name in missing_columns
+        ]
+        
+        # executescript() commits any pending transaction before it runs, so
+        # the transaction is opened inside the script and stays open for the
+        # UPDATE below
+        cursor.executescript("BEGIN IMMEDIATE;\n" + ";\n".join(statements) + ";")
+        
+        if missing_columns:
+            print(f"   ✓ Added columns: {', '.join(missing_columns)}")
+        if len(missing_columns) < len(columns_to_add):
+            print(f"   ⚠️  {len(columns_to_add) - len(missing_columns)} column(s) already existed, skipped")
         
-        conn.commit()
         print("\n✅ All columns added successfully!")
         
         # Initialize existing cards
         print("\n🔄 Initializing existing flashcards with SM-2 defaults...")
         
-        now = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-        
         cursor.execute("""
             UPDATE flashcards 
             SET 
                 ease_factor = COALESCE(ease_factor, 2.5),
                 interval = COALESCE(interval, 0),
                 repetitions = COALESCE(repetitions, 0),
-                next_review_date = COALESCE(next_review_date, ?),
+                next_review_date = COALESCE(next_review_date, datetime('now')),
                 learning_state = COALESCE(
                     learning_state,
                     CASE 
@@ -71,28 +82,33 @@ def run_migration():
                         ELSE 'learning'
                     END
                 )
-        """, (now,))
-        
+            WHERE ease_factor IS NULL
+               OR interval IS NULL
+               OR repetitions IS NULL
+               OR next_review_date IS NULL
+               OR learning_state IS NULL
+        """)
+        
+        # Only rows with a missing SM-2 value are rewritten, so a re-run
+        # touches nothing
         affected_rows = cursor.rowcount
         conn.commit()
+        cursor.execute("PRAGMA synchronous=FULL")
         
-        print(f"✅ Initialized {affected_rows} flashcards with defaults")
+        print(f"✅ Initialized {affected_rows} flashcards with defaults in this run")
         
         # Verify migration
         print("\n🔍 Verifying migration...")
-        cursor.execute("PRAGMA table_info(flashcards)")
-        columns = cursor.fetchall()
-        
-        sm2_columns = ['ease_factor', 'interval', 'repetitions', 'next_review_date', 'last_reviewed', 'learning_state']
-        found_columns = [col[1] for col in columns]
+        cursor.execute("SELECT name FROM pragma_table_info('flashcards')")
+        found_columns = frozenset(row[0] for row in cursor.fetchall())
         
-        all_present = all(col in found_columns for col in sm2_columns)
+        sm2_columns = frozenset(column_name for column_name, _ in columns_to_add)
+        missing = sm2_columns - found_columns
         
-        if all_present:
+        if not missing:
             print("✅ All SM-2 columns verified!")
         else:
-            missing = [col for col in sm2_columns if col not in found_columns]
-            print(f"⚠️  Missing columns: {missing}")
+            print(f"⚠️  Missing columns: {sorted(missing)}")
         
         # Show sample data
         cursor.execute("SELECT COUNT(*) FROM flashcards")
@@ -111,7 +127,7 @@ def run_migration():
             stats = cursor.fetchone()
             
             print("\n📊 Card Distribution:")
-            print(f"   Total: {stats[0]}")
+            print(f"   Total: {stats[0]} ({stats[0] - affected_rows} already initialized)")
             print(f"   New: {stats[1]}")
             print(f"   Learning: {stats[2]}")
             print(f"   Review: {stats[3]}")
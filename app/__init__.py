@@ -1,5 +1,5 @@
 import os
-from flask import Flask
+from flask import Flask, g
 from flask_wtf.csrf import generate_csrf
 from app.config import config
 from app.extensions import db, migrate, login_manager, csrf
@@ -10,6 +10,14 @@ from app.utils.helpers import (
     pluralize, get_study_recommendation
 )
 
+_DIFFICULTY_LABELS = {
+    1: 'Very Easy',
+    2: 'Easy',
+    3: 'Medium',
+    4: 'Hard',
+    5: 'Very Hard'
+}
+
 def create_app(config_name=None):
     """Application factory pattern"""
     if config_name is None:
@@ -43,11 +51,36 @@ def create_app(config_name=None):
     @login_manager.user_loader
     def load_user(user_id):
         from app.models import User
-        return User.query.get(int(user_id))
-
-    # Create database tables
-    with app.app_context():
-        db.create_all()
+        # g lives for one request, so each user is loaded at most once per request
+        cache_key = f'_cached_user_{user_id}'
+        if cache_key not in g:
+            setattr(g, cache_key, db.session.get(User, int(user_id)))
+        return g.get(cache_key)
+
+    # Write AI usage rows queued during the request in one batch
+    @app.after_request
+    def flush_ai_usage(response):
+        from app.models import AIUsage
+        try:
+            AIUsage.flush_pending()
+        except Exception as e:
+            print(f"Failed to flush AI usage logs: {e}")
+        return response
+
+    # Stamp last_accessed for documents opened during the request in one UPDATE
+    @app.after_request
+    def flush_document_access(response):
+        from app.models import Document
+        try:
+            Document.flush_accessed()
+        except Exception as e:
+            print(f"Failed to update document access times: {e}")
+        return response
+
+    # Create database tables (development only unless AUTO_CREATE_TABLES is set)
+    if app.config.get('AUTO_CREATE_TABLES', app.debug):
+        with app.app_context():
+            db.create_all()
 
     return app
 
@@ -85,11 +118,4 @@ def register_template_helpers(app):
 
     @app.template_global()
     def difficulty_label(difficulty):
-        labels = {
-            1: 'Very Easy',
-            2: 'Easy',
-            3: 'Medium',
-            4: 'Hard',
-            5: 'Very Hard'
-        }
-        return labels.get(difficulty, 'Unknown')
+        return _DIFFICULTY_LABELS.get(difficulty, 'Unknown')
@@ -14,6 +14,22 @@ class Config:
         'sqlite:///' + os.path.join(basedir, 'flashcards.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Connection pool for server databases; SQLite keeps Flask-SQLAlchemy's
+    # defaults since its pools don't take these options
+    if SQLALCHEMY_DATABASE_URI.startswith('sqlite'):
+        SQLALCHEMY_ENGINE_OPTIONS = {}
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', '20')),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '10')),
+            'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', '30')),
+            'pool_recycle': 3600,  # seconds - stay under server idle timeouts
+            'pool_pre_ping': True
+        }
+
+    # CSRF: only verify tokens on state-changing methods
+    WTF_CSRF_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
     # Flash message categories
     FLASH_CATEGORIES = ['success', 'info', 'warning', 'error']
 
@@ -31,6 +47,9 @@ class Config:
     AI_MAX_CARDS_PER_GENERATION = int(os.environ.get('AI_MAX_CARDS_PER_GENERATION', '50'))
     AI_REQUEST_TIMEOUT = int(os.environ.get('AI_REQUEST_TIMEOUT', '30'))
     AI_RATE_LIMIT_PER_HOUR = int(os.environ.get('AI_RATE_LIMIT_PER_HOUR', '50'))
+    # Optional: count rate-limit hits in Redis instead of ai_usage_logs and
+    # cache usage/deck statistics there (requires the redis package)
+    REDIS_URL = os.environ.get('REDIS_URL')
 
     # AI Feature Flags
     AI_CARD_GENERATION_ENABLED = os.environ.get('AI_CARD_GENERATION_ENABLED', 'true').lower() == 'true'
@@ -51,10 +70,14 @@ class Config:
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_ECHO = True
+    AUTO_CREATE_TABLES = True
 
 
 class ProductionConfig(Config):
     DEBUG = False
+    # Tables are created by `python cli.py init-db` and the migration scripts,
+    # not on every worker boot
+    AUTO_CREATE_TABLES = os.environ.get('AUTO_CREATE_TABLES', 'false').lower() == 'true'
 
 
 config = {
@@ -1,8 +1,15 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_wtf.csrf import CSRFProtect
 
+# Redis is optional; features that use it fall back to the database
+try:
+    import redis
+except ImportError:
+    redis = None
+
 # Initialize extensions
 db = SQLAlchemy()
 migrate = Migrate()
@@ -13,3 +20,17 @@ csrf = CSRFProtect()
 login_manager.login_view = 'auth.login'
 login_manager.login_message = 'Please log in to access this page.'
 login_manager.login_message_category = 'info'
+
+_redis_client = None
+
+
+def get_redis():
+    """Return the shared Redis client, or None when REDIS_URL is unset"""
+    global _redis_client
+    if redis is None or not current_app.config.get('REDIS_URL'):
+        return None
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            current_app.config['REDIS_URL'], socket_timeout=0.5
+        )
+    return _redis_client
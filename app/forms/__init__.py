@@ -1,70 +1,54 @@
-from app.forms.auth_forms import (
-    LoginForm,
-    RegistrationForm,
-    ChangePasswordForm,
-    ProfileForm
-)
+import importlib
 
-from app.forms.deck_forms import (
-    DeckForm,
-    FlashcardForm,
-    QuickFlashcardForm,
-    BulkFlashcardForm,
-    StudyOptionsForm,
-    DeckSearchForm,
-    DuplicateDeckForm
-)
-
-from app.forms.base_forms import (
-    BaseForm,
-    SearchForm,
-    ConfirmationForm,
-    PaginationForm
-)
-
-from app.forms.mc_generation_forms import (
-    MCGenerationRequestForm,
-    MCQuestionEditForm,
-    MCManualCreateForm
-)
-
-from app.forms.mc_study_forms import (
-    MCSessionStartForm,
-    MCAnswerSubmitForm,
-    MCFeedbackContinueForm,
-    MCSessionFilterForm
-)
-
-__all__ = [
+# Form class -> module that defines it. Modules are imported on first
+# access (PEP 562), so a view only loads the form modules it uses.
+_LAZY = {
     # Auth forms
-    'LoginForm',
-    'RegistrationForm',
-    'ChangePasswordForm',
-    'ProfileForm',
+    'LoginForm': 'app.forms.auth_forms',
+    'RegistrationForm': 'app.forms.auth_forms',
+    'ChangePasswordForm': 'app.forms.auth_forms',
+    'ProfileForm': 'app.forms.auth_forms',
 
     # Deck forms
-    'DeckForm',
-    'FlashcardForm',
-    'QuickFlashcardForm',
-    'BulkFlashcardForm',
-    'StudyOptionsForm',
-    'DeckSearchForm',
-    'DuplicateDeckForm',
+    'DeckForm': 'app.forms.deck_forms',
+    'FlashcardForm': 'app.forms.deck_forms',
+    'QuickFlashcardForm': 'app.forms.deck_forms',
+    'BulkFlashcardForm': 'app.forms.deck_forms',
+    'StudyOptionsForm': 'app.forms.deck_forms',
+    'DeckSearchForm': 'app.forms.deck_forms',
+    'DuplicateDeckForm': 'app.forms.deck_forms',
 
     # Base forms
-    'BaseForm',
-    'SearchForm',
-    'ConfirmationForm',
-    'PaginationForm',
+    'BaseForm': 'app.forms.base_forms',
+    'SearchForm': 'app.forms.base_forms',
+    'ConfirmationForm': 'app.forms.base_forms',
+    'PaginationForm': 'app.forms.base_forms',
 
     # MC Generation forms
-    'MCGenerationRequestForm',
-    'MCQuestionEditForm',
-    'MCManualCreateForm',
+    'MCGenerationRequestForm': 'app.forms.mc_generation_forms',
+    'MCQuestionEditForm': 'app.forms.mc_generation_forms',
+    'MCManualCreateForm': 'app.forms.mc_generation_forms',
 
     # MC Study forms
-    'MCSessionStartForm',
-    'MCAnswerSubmitForm',
-    'MCFeedbackContinueForm',
-    'MCSessionFilterForm'
-]
+    'MCSessionStartForm': 'app.forms.mc_study_forms',
+    'MCAnswerSubmitForm': 'app.forms.mc_study_forms',
+    'MCFeedbackContinueForm': 'app.forms.mc_study_forms',
+    'MCSessionFilterForm': 'app.forms.mc_study_forms'
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,6 +1,30 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SelectField, IntegerField, SubmitField
-from wtforms.validators import DataRequired, Length, NumberRange, Optional
+from wtforms.validators import DataRequired, Length, NumberRange
+from app.utils.validators import BoundedNonEmpty
+from app.forms.base_forms import REQUIRED, OPTIONAL, CONTROL_KW
+
+
+# Select field choices
+DIFFICULTY_CHOICES = (
+    ('easy', 'Easy - Basic recall and definitions'),
+    ('medium', 'Medium - Understanding and application'),
+    ('hard', 'Hard - Analysis and complex concepts')
+)
+
+ENHANCEMENT_CHOICES = (
+    ('clarity', 'Make Clearer - Improve question and answer clarity'),
+    ('examples', 'Add Examples - Include concrete examples'),
+    ('simplify', 'Simplify - Use simpler language'),
+    ('detail', 'Add Detail - Provide more comprehensive answer')
+)
+
+BULK_ENHANCEMENT_CHOICES = (
+    ('clarity', 'Make Clearer'),
+    ('examples', 'Add Examples'),
+    ('simplify', 'Simplify Language'),
+    ('detail', 'Add More Detail')
+)
 
 
 class AIGenerateCardsForm(FlaskForm):
@@ -9,8 +33,8 @@ class AIGenerateCardsForm(FlaskForm):
     topic = StringField(
         'Topic or Subject',
         validators=[
-            DataRequired(message='Please enter a topic'),
-            Length(min=3, max=200, message='Topic must be between 3 and 200 characters')
+            BoundedNonEmpty(3, 200, 'Topic must be between 3 and 200 characters',
+                            required_message='Please enter a topic')
         ],
         render_kw={
             'placeholder': 'e.g., Spanish irregular verbs, Python data structures, World War 2 battles',
@@ -25,25 +49,21 @@ class AIGenerateCardsForm(FlaskForm):
             NumberRange(min=1, max=50, message='Must generate between 1 and 50 cards')
         ],
         default=10,
-        render_kw={'class': 'form-control'}
+        render_kw=CONTROL_KW
     )
 
     difficulty = SelectField(
         'Difficulty Level',
-        choices=[
-            ('easy', 'Easy - Basic recall and definitions'),
-            ('medium', 'Medium - Understanding and application'),
-            ('hard', 'Hard - Analysis and complex concepts')
-        ],
+        choices=DIFFICULTY_CHOICES,
         default='medium',
-        validators=[DataRequired()],
-        render_kw={'class': 'form-control'}
+        validators=[REQUIRED],
+        render_kw=CONTROL_KW
     )
 
     context = TextAreaField(
         'Additional Instructions (Optional)',
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=500, message='Additional context must be less than 500 characters')
         ],
         render_kw={
@@ -61,15 +81,10 @@ class AIEnhanceCardForm(FlaskForm):
 
     enhancement_type = SelectField(
         'Enhancement Type',
-        choices=[
-            ('clarity', 'Make Clearer - Improve question and answer clarity'),
-            ('examples', 'Add Examples - Include concrete examples'),
-            ('simplify', 'Simplify - Use simpler language'),
-            ('detail', 'Add Detail - Provide more comprehensive answer')
-        ],
+        choices=ENHANCEMENT_CHOICES,
         default='clarity',
-        validators=[DataRequired()],
-        render_kw={'class': 'form-control'}
+        validators=[REQUIRED],
+        render_kw=CONTROL_KW
     )
 
     submit = SubmitField('Enhance Card', render_kw={'class': 'btn btn-success'})
@@ -80,25 +95,20 @@ class AIBulkEnhanceForm(FlaskForm):
 
     enhancement_type = SelectField(
         'Enhancement Type',
-        choices=[
-            ('clarity', 'Make Clearer'),
-            ('examples', 'Add Examples'),
-            ('simplify', 'Simplify Language'),
-            ('detail', 'Add More Detail')
-        ],
+        choices=BULK_ENHANCEMENT_CHOICES,
         default='clarity',
-        validators=[DataRequired()],
-        render_kw={'class': 'form-control'}
+        validators=[REQUIRED],
+        render_kw=CONTROL_KW
     )
 
     card_limit = IntegerField(
         'Maximum Cards to Enhance',
         validators=[
-            DataRequired(),
+            REQUIRED,
             NumberRange(min=1, max=50, message='Can enhance 1-50 cards at a time')
         ],
         default=10,
-        render_kw={'class': 'form-control'}
+        render_kw=CONTROL_KW
     )
 
     submit = SubmitField('Enhance Selected Cards', render_kw={'class': 'btn btn-success'})
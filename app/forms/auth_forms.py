@@ -1,25 +1,32 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, PasswordField, BooleanField, SubmitField
-from wtforms.validators import DataRequired, Length, Email, EqualTo, ValidationError
-from app.forms.base_forms import BaseForm
-from app.services import AuthService
+from wtforms.validators import Email, EqualTo, ValidationError
+from app.utils.validators import BoundedNonEmpty
+from app.forms.base_forms import BaseForm, REQUIRED, CONTROL_KW, CHECK_KW
+
+
+# Validators repeated across the registration, password and profile forms
+USERNAME = BoundedNonEmpty(3, 80, 'Username must be between 3 and 80 characters')
+EMAIL_FORMAT = Email(message='Please enter a valid email address')
+EMAIL = BoundedNonEmpty(max=120)
+PASSWORD = BoundedNonEmpty(min=6, message='Password must be at least 6 characters long')
 
 
 class LoginForm(BaseForm):
     """User login form"""
     username_or_email = StringField(
         'Username or Email',
-        validators=[DataRequired(), Length(min=3, max=120)],
+        validators=[BoundedNonEmpty(3, 120)],
         render_kw={'placeholder': 'Enter username or email', 'class': 'form-control'}
     )
     password = PasswordField(
         'Password',
-        validators=[DataRequired()],
+        validators=[REQUIRED],
         render_kw={'placeholder': 'Enter password', 'class': 'form-control'}
     )
     remember_me = BooleanField(
         'Remember me',
-        render_kw={'class': 'form-check-input'}
+        render_kw=CHECK_KW
     )
     submit = SubmitField(
         'Sign In',
@@ -31,33 +38,23 @@ class RegistrationForm(BaseForm):
     """User registration form"""
     username = StringField(
         'Username',
-        validators=[
-            DataRequired(),
-            Length(min=3, max=80, message='Username must be between 3 and 80 characters')
-        ],
+        validators=[USERNAME],
         render_kw={'placeholder': 'Choose a username', 'class': 'form-control'}
     )
     email = StringField(
         'Email',
-        validators=[
-            DataRequired(),
-            Email(message='Please enter a valid email address'),
-            Length(max=120)
-        ],
+        validators=[EMAIL, EMAIL_FORMAT],
         render_kw={'placeholder': 'Enter your email', 'class': 'form-control'}
     )
     password = PasswordField(
         'Password',
-        validators=[
-            DataRequired(),
-            Length(min=6, message='Password must be at least 6 characters long')
-        ],
+        validators=[PASSWORD],
         render_kw={'placeholder': 'Create a password', 'class': 'form-control'}
     )
     password2 = PasswordField(
         'Confirm Password',
         validators=[
-            DataRequired(),
+            REQUIRED,
             EqualTo('password', message='Passwords must match')
         ],
         render_kw={'placeholder': 'Confirm your password', 'class': 'form-control'}
@@ -67,14 +64,26 @@ class RegistrationForm(BaseForm):
         render_kw={'class': 'btn btn-success btn-block'}
     )
 
+    def validate(self, extra_validators=None):
+        """Look up username and email together, then run field validation"""
+        self._existing = None
+        return super().validate(extra_validators)
+
+    def _taken(self):
+        """Return (username_taken, email_taken), querying once per validation"""
+        if getattr(self, '_existing', None) is None:
+            from app.services import AuthService
+            self._existing = AuthService.find_taken(self.username.data, self.email.data)
+        return self._existing
+
     def validate_username(self, username):
         """Check if username is already taken"""
-        if AuthService.exists(username=username.data):
+        if self._taken()[0]:
             raise ValidationError('Username already taken. Please choose a different one.')
 
     def validate_email(self, email):
         """Check if email is already registered"""
-        if AuthService.exists(email=email.data):
+        if self._taken()[1]:
             raise ValidationError('Email already registered. Please use a different email.')
 
 
@@ -82,21 +91,18 @@ class ChangePasswordForm(BaseForm):
     """Change password form"""
     current_password = PasswordField(
         'Current Password',
-        validators=[DataRequired()],
+        validators=[REQUIRED],
         render_kw={'placeholder': 'Enter current password', 'class': 'form-control'}
     )
     new_password = PasswordField(
         'New Password',
-        validators=[
-            DataRequired(),
-            Length(min=6, message='Password must be at least 6 characters long')
-        ],
+        validators=[PASSWORD],
         render_kw={'placeholder': 'Enter new password', 'class': 'form-control'}
     )
     new_password2 = PasswordField(
         'Confirm New Password',
         validators=[
-            DataRequired(),
+            REQUIRED,
             EqualTo('new_password', message='Passwords must match')
         ],
         render_kw={'placeholder': 'Confirm new password', 'class': 'form-control'}
@@ -111,20 +117,13 @@ class ProfileForm(BaseForm):
     """User profile edit form"""
     username = StringField(
         'Username',
-        validators=[
-            DataRequired(),
-            Length(min=3, max=80, message='Username must be between 3 and 80 characters')
-        ],
-        render_kw={'class': 'form-control'}
+        validators=[USERNAME],
+        render_kw=CONTROL_KW
     )
     email = StringField(
         'Email',
-        validators=[
-            DataRequired(),
-            Email(message='Please enter a valid email address'),
-            Length(max=120)
-        ],
-        render_kw={'class': 'form-control'}
+        validators=[EMAIL, EMAIL_FORMAT],
+        render_kw=CONTROL_KW
     )
     submit = SubmitField(
         'Update Profile',
@@ -138,12 +137,14 @@ class ProfileForm(BaseForm):
 
     def validate_username(self, username):
         """Check if username is already taken (excluding current user)"""
+        from app.services import AuthService
         if username.data != self.original_username:
             if AuthService.exists(username=username.data):
                 raise ValidationError('Username already taken. Please choose a different one.')
 
     def validate_email(self, email):
         """Check if email is already registered (excluding current user)"""
+        from app.services import AuthService
         if email.data != self.original_email:
             if AuthService.exists(email=email.data):
                 raise ValidationError('Email already registered. Please use a different email.')
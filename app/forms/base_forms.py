@@ -1,6 +1,17 @@
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SelectField, IntegerField
-from wtforms.validators import DataRequired, Length, NumberRange
+from wtforms.validators import DataRequired, Length, NumberRange, Optional, ValidationError
+
+
+# Validators hold no per-call state, so one instance serves every field
+REQUIRED = DataRequired()
+OPTIONAL = Optional()
+
+# Shared render_kw for plain inputs; WTForms merges render_kw into a new dict
+# when rendering and never mutates it
+CONTROL_KW = {'class': 'form-control'}
+SELECT_KW = {'class': 'form-select'}
+CHECK_KW = {'class': 'form-check-input'}
 
 
 class BaseForm(FlaskForm):
@@ -35,7 +46,7 @@ class ConfirmationForm(BaseForm):
     """Generic confirmation form for dangerous operations"""
     confirmation = StringField(
         'Type "CONFIRM" to proceed',
-        validators=[DataRequired()],
+        validators=[REQUIRED],
         render_kw={'placeholder': 'CONFIRM', 'class': 'form-control'}
     )
 
@@ -48,7 +59,7 @@ class PaginationForm(BaseForm):
     """Form for pagination controls"""
     per_page = SelectField(
         'Items per page',
-        choices=[(10, '10'), (20, '20'), (50, '50')],
+        choices=((10, '10'), (20, '20'), (50, '50')),
         coerce=int,
         default=20
     )
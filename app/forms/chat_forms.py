@@ -4,7 +4,30 @@ Chat Forms - Forms for chat interface interactions
 
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, SelectField, HiddenField
-from wtforms.validators import DataRequired, Length, Optional, ValidationError
+from wtforms.validators import DataRequired, Length, ValidationError
+from app.utils.validators import BoundedNonEmpty
+from app.forms.base_forms import REQUIRED, OPTIONAL, SELECT_KW
+
+
+# Select field choices
+SORT_BY_CHOICES = (
+    ('recent', 'Most Recent'),
+    ('oldest', 'Oldest First'),
+    ('title', 'Title (A-Z)'),
+    ('messages', 'Most Messages')
+)
+
+EXPORT_FORMAT_CHOICES = (
+    ('txt', 'Plain Text'),
+    ('md', 'Markdown'),
+    ('pdf', 'PDF'),
+    ('json', 'JSON')
+)
+
+YES_NO_CHOICES = (
+    ('yes', 'Yes'),
+    ('no', 'No')
+)
 
 
 class ChatMessageForm(FlaskForm):
@@ -13,8 +36,8 @@ class ChatMessageForm(FlaskForm):
     message = TextAreaField(
         'Message',
         validators=[
-            DataRequired(message='Message cannot be empty'),
-            Length(min=1, max=10000, message='Message must be between 1 and 10000 characters')
+            BoundedNonEmpty(1, 10000, 'Message must be between 1 and 10000 characters',
+                            required_message='Message cannot be empty')
         ],
         render_kw={
             'placeholder': 'Type your message here...',
@@ -32,7 +55,7 @@ class NewChatSessionForm(FlaskForm):
     title = StringField(
         'Session Title',
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=255, message='Title cannot exceed 255 characters')
         ],
         render_kw={
@@ -41,18 +64,15 @@ class NewChatSessionForm(FlaskForm):
         }
     )
 
+    # The view extends these choices with the user's documents
     document_id = SelectField(
         'Attach Document (Optional)',
         coerce=int,
-        validators=[Optional()],
-        render_kw={'class': 'form-select'}
+        choices=((0, 'No document'),),
+        validators=[OPTIONAL],
+        render_kw=SELECT_KW
     )
 
-    def __init__(self, *args, **kwargs):
-        super(NewChatSessionForm, self).__init__(*args, **kwargs)
-        # Choices will be set in the view with user's documents
-        self.document_id.choices = [(0, 'No document')]
-
 
 class RenameSessionForm(FlaskForm):
     """Form for renaming a chat session"""
@@ -60,8 +80,8 @@ class RenameSessionForm(FlaskForm):
     title = StringField(
         'New Title',
         validators=[
-            DataRequired(message='Title is required'),
-            Length(min=1, max=255, message='Title must be between 1 and 255 characters')
+            BoundedNonEmpty(1, 255, 'Title must be between 1 and 255 characters',
+                            required_message='Title is required')
         ],
         render_kw={
             'placeholder': 'Enter new title',
@@ -75,20 +95,17 @@ class RenameSessionForm(FlaskForm):
 class AttachDocumentForm(FlaskForm):
     """Form for attaching a document to a chat session"""
 
+    # Choices will be set in the view with user's documents
     document_id = SelectField(
         'Select Document',
         coerce=int,
+        choices=(),
         validators=[DataRequired(message='Please select a document')],
-        render_kw={'class': 'form-select'}
+        render_kw=SELECT_KW
     )
 
     session_id = HiddenField('Session ID')
 
-    def __init__(self, *args, **kwargs):
-        super(AttachDocumentForm, self).__init__(*args, **kwargs)
-        # Choices will be set in the view with user's documents
-        self.document_id.choices = []
-
     def validate_document_id(self, field):
         """Ensure a valid document is selected"""
         if field.data == 0:
@@ -98,10 +115,14 @@ class AttachDocumentForm(FlaskForm):
 class SearchSessionsForm(FlaskForm):
     """Form for searching and filtering chat sessions"""
 
+    class Meta:
+        # Submitted via GET and changes nothing, so skip the CSRF token
+        csrf = False
+
     search = StringField(
         'Search',
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=100, message='Search query too long')
         ],
         render_kw={
@@ -112,24 +133,19 @@ class SearchSessionsForm(FlaskForm):
 
     sort_by = SelectField(
         'Sort By',
-        choices=[
-            ('recent', 'Most Recent'),
-            ('oldest', 'Oldest First'),
-            ('title', 'Title (A-Z)'),
-            ('messages', 'Most Messages')
-        ],
+        choices=SORT_BY_CHOICES,
         default='recent',
-        validators=[Optional()],
-        render_kw={'class': 'form-select'}
+        validators=[OPTIONAL],
+        render_kw=SELECT_KW
     )
 
     filter_document = SelectField(
         'Filter by Document',
         coerce=int,
-        choices=[(0, 'All Sessions')],
+        choices=((0, 'All Sessions'),),
         default=0,
-        validators=[Optional()],
-        render_kw={'class': 'form-select'}
+        validators=[OPTIONAL],
+        render_kw=SELECT_KW
     )
 
 
@@ -138,26 +154,18 @@ class ExportChatForm(FlaskForm):
 
     format = SelectField(
         'Export Format',
-        choices=[
-            ('txt', 'Plain Text'),
-            ('md', 'Markdown'),
-            ('pdf', 'PDF'),
-            ('json', 'JSON')
-        ],
+        choices=EXPORT_FORMAT_CHOICES,
         default='txt',
-        validators=[DataRequired()],
-        render_kw={'class': 'form-select'}
+        validators=[REQUIRED],
+        render_kw=SELECT_KW
     )
 
     include_timestamps = SelectField(
         'Include Timestamps',
-        choices=[
-            ('yes', 'Yes'),
-            ('no', 'No')
-        ],
+        choices=YES_NO_CHOICES,
         default='yes',
-        validators=[DataRequired()],
-        render_kw={'class': 'form-select'}
+        validators=[REQUIRED],
+        render_kw=SELECT_KW
     )
 
     session_id = HiddenField('Session ID')
@@ -1,23 +1,57 @@
+from dataclasses import dataclass
 from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, BooleanField, SubmitField, SelectField, FieldList, FormField
-from wtforms.validators import DataRequired, Length, Optional
-from app.forms.base_forms import BaseForm
+from wtforms.validators import DataRequired, Length
+from app.utils.validators import BoundedNonEmpty
+from app.forms.base_forms import BaseForm, OPTIONAL, CONTROL_KW, CHECK_KW
+
+
+# Validators repeated across the deck and quick-add forms
+DECK_NAME = BoundedNonEmpty(1, 100, 'Deck name must be between 1 and 100 characters',
+                            required_message='Deck name is required')
+QUICK_TEXT = BoundedNonEmpty(1, 200)
+
+# Select field choices
+STUDY_MODE_CHOICES = (
+    ('random', 'Random Order'),
+    ('newest', 'Newest First'),
+    ('oldest', 'Oldest First'),
+    ('difficulty_asc', 'Easy to Hard'),
+    ('difficulty_desc', 'Hard to Easy'),
+    ('accuracy_asc', 'Worst Performance First'),
+    ('accuracy_desc', 'Best Performance First'),
+    ('least_studied', 'Least Studied First')
+)
+
+CARD_LIMIT_CHOICES = (
+    (0, 'All Cards'),
+    (5, '5 Cards'),
+    (10, '10 Cards'),
+    (15, '15 Cards'),
+    (20, '20 Cards'),
+    (25, '25 Cards'),
+    (50, '50 Cards')
+)
+
+
+@dataclass(slots=True)
+class CardIn:
+    """Front and back text for one card to be created"""
+    front_text: str
+    back_text: str
 
 
 class DeckForm(BaseForm):
     """Create/Edit deck form"""
     name = StringField(
         'Deck Name',
-        validators=[
-            DataRequired(message='Deck name is required'),
-            Length(min=1, max=100, message='Deck name must be between 1 and 100 characters')
-        ],
+        validators=[DECK_NAME],
         render_kw={'placeholder': 'Enter deck name', 'class': 'form-control'}
     )
     description = TextAreaField(
         'Description',
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=500, message='Description must be less than 500 characters')
         ],
         render_kw={
@@ -28,7 +62,7 @@ class DeckForm(BaseForm):
     )
     is_public = BooleanField(
         'Make this deck public',
-        render_kw={'class': 'form-check-input'},
+        render_kw=CHECK_KW,
         description='Public decks can be viewed and copied by other users'
     )
     submit = SubmitField(
@@ -42,8 +76,8 @@ class FlashcardForm(BaseForm):
     front_text = TextAreaField(
         'Front (Question)',
         validators=[
-            DataRequired(message='Front text is required'),
-            Length(min=1, max=1000, message='Front text must be between 1 and 1000 characters')
+            BoundedNonEmpty(1, 1000, 'Front text must be between 1 and 1000 characters',
+                            required_message='Front text is required')
         ],
         render_kw={
             'placeholder': 'Enter the question or prompt',
@@ -54,8 +88,8 @@ class FlashcardForm(BaseForm):
     back_text = TextAreaField(
         'Back (Answer)',
         validators=[
-            DataRequired(message='Back text is required'),
-            Length(min=1, max=1000, message='Back text must be between 1 and 1000 characters')
+            BoundedNonEmpty(1, 1000, 'Back text must be between 1 and 1000 characters',
+                            required_message='Back text is required')
         ],
         render_kw={
             'placeholder': 'Enter the answer or explanation',
@@ -73,12 +107,12 @@ class QuickFlashcardForm(BaseForm):
     """Quick add flashcard form (simplified)"""
     front_text = StringField(
         'Question',
-        validators=[DataRequired(), Length(min=1, max=200)],
+        validators=[QUICK_TEXT],
         render_kw={'placeholder': 'Quick question', 'class': 'form-control'}
     )
     back_text = StringField(
         'Answer',
-        validators=[DataRequired(), Length(min=1, max=200)],
+        validators=[QUICK_TEXT],
         render_kw={'placeholder': 'Quick answer', 'class': 'form-control'}
     )
     submit = SubmitField(
@@ -107,56 +141,33 @@ class BulkFlashcardForm(BaseForm):
     )
 
     def parse_cards(self):
-        """Parse the bulk text into individual cards"""
-        cards = []
-        if self.cards_text.data:
-            lines = self.cards_text.data.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and '|' in line:
-                    parts = line.split('|', 1)  # Split on first pipe only
-                    if len(parts) == 2:
-                        front = parts[0].strip()
-                        back = parts[1].strip()
-                        if front and back:
-                            cards.append({
-                                'front_text': front,
-                                'back_text': back
-                            })
-        return cards
+        """Parse the bulk text into a list of CardIn"""
+        if not self.cards_text.data:
+            return []
+        # partition() splits on the first pipe only and yields an empty
+        # separator for lines without one
+        parts = (line.partition('|') for line in self.cards_text.data.splitlines())
+        return [
+            CardIn(front, back)
+            for raw_front, sep, raw_back in parts
+            if sep and (front := raw_front.strip()) and (back := raw_back.strip())
+        ]
 
 
 class StudyOptionsForm(BaseForm):
     """Study session options form"""
     study_mode = SelectField(
         'Study Mode',
-        choices=[
-            ('random', 'Random Order'),
-            ('newest', 'Newest First'),
-            ('oldest', 'Oldest First'),
-            ('difficulty_asc', 'Easy to Hard'),
-            ('difficulty_desc', 'Hard to Easy'),
-            ('accuracy_asc', 'Worst Performance First'),
-            ('accuracy_desc', 'Best Performance First'),
-            ('least_studied', 'Least Studied First')
-        ],
+        choices=STUDY_MODE_CHOICES,
         default='random',
-        render_kw={'class': 'form-control'}
+        render_kw=CONTROL_KW
     )
     card_limit = SelectField(
         'Number of Cards',
-        choices=[
-            (0, 'All Cards'),
-            (5, '5 Cards'),
-            (10, '10 Cards'),
-            (15, '15 Cards'),
-            (20, '20 Cards'),
-            (25, '25 Cards'),
-            (50, '50 Cards')
-        ],
+        choices=CARD_LIMIT_CHOICES,
         coerce=int,
         default=0,
-        render_kw={'class': 'form-control'}
+        render_kw=CONTROL_KW
     )
     submit = SubmitField(
         'Start Study Session',
@@ -166,6 +177,11 @@ class StudyOptionsForm(BaseForm):
 
 class DeckSearchForm(BaseForm):
     """Search decks form"""
+
+    class Meta:
+        # Submitted via GET and changes nothing, so skip the CSRF token
+        csrf = False
+
     query = StringField(
         'Search Decks',
         validators=[Length(max=100)],
@@ -177,7 +193,7 @@ class DeckSearchForm(BaseForm):
     include_public = BooleanField(
         'Include public decks',
         default=True,
-        render_kw={'class': 'form-check-input'}
+        render_kw=CHECK_KW
     )
     submit = SubmitField(
         'Search',
@@ -189,11 +205,8 @@ class DuplicateDeckForm(BaseForm):
     """Form to duplicate/copy a deck"""
     name = StringField(
         'New Deck Name',
-        validators=[
-            DataRequired(message='Deck name is required'),
-            Length(min=1, max=100)
-        ],
-        render_kw={'class': 'form-control'}
+        validators=[DECK_NAME],
+        render_kw=CONTROL_KW
     )
     submit = SubmitField(
         'Copy Deck',
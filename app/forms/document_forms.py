@@ -3,11 +3,45 @@ Document Forms
 Forms for document upload and management
 """
 
+import os
+from functools import lru_cache
+
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileField, FileRequired
 from wtforms import StringField, SelectField, ValidationError
-from wtforms.validators import Optional, Length
+from wtforms.validators import Length
 from flask import current_app
+from app.forms.base_forms import OPTIONAL
+
+
+# Select field choices
+SORT_BY_CHOICES = (
+    ('upload_date', 'Upload Date'),
+    ('original_filename', 'Name'),
+    ('file_size', 'File Size')
+)
+
+ORDER_CHOICES = (
+    ('desc', 'Newest First'),
+    ('asc', 'Oldest First')
+)
+
+FILE_TYPE_CHOICES = (
+    ('all', 'All Types'),
+    ('pdf', 'PDF'),
+    ('txt', 'Text'),
+    ('epub', 'EPUB'),
+    ('docx', 'Word Document')
+)
+
+
+DEFAULT_DOCUMENT_EXTENSIONS = ('pdf', 'txt', 'epub', 'docx')
+
+
+@lru_cache(maxsize=None)
+def _allowed_extensions(app):
+    """Return the app's allowed upload extensions, read from config once per app"""
+    return frozenset(app.config.get('ALLOWED_DOCUMENT_EXTENSIONS', DEFAULT_DOCUMENT_EXTENSIONS))
 
 
 def allowed_document_file(form, field):
@@ -19,21 +53,14 @@ def allowed_document_file(form, field):
     if not filename:
         raise ValidationError('No filename provided')
 
-    print(f"DEBUG: Processing filename: '{filename}'")  # DEBUG
-
-    # Check if file has extension
-    if '.' not in filename:
-        print(f"DEBUG: No extension found in filename")  # DEBUG
+    # Get extension (case-insensitive); splitext ignores dots in directory
+    # names and leading dots, so '.pdf' and 'dir.v2/file' have none
+    ext = os.path.splitext(filename)[1][1:].lower()
+    if not ext:
         raise ValidationError('File must have an extension')
 
-    # Get extension (case-insensitive)
-    ext = filename.rsplit('.', 1)[1].lower()
-    print(f"DEBUG: Detected extension: '{ext}'")  # DEBUG
-
     # Check against allowed extensions from current app config
-    allowed_extensions = current_app.config.get('ALLOWED_DOCUMENT_EXTENSIONS', {'pdf', 'txt', 'epub', 'docx'})
-    print(f"DEBUG: Allowed extensions: {allowed_extensions}")  # DEBUG
-    print(f"DEBUG: Extension in allowed? {ext in allowed_extensions}")  # DEBUG
+    allowed_extensions = _allowed_extensions(current_app._get_current_object())
 
     if ext not in allowed_extensions:
         allowed = ', '.join(sorted(allowed_extensions))
@@ -54,7 +81,7 @@ class DocumentUploadForm(FlaskForm):
     title = StringField(
         'Custom Title (Optional)',
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=255, message='Title must be less than 255 characters')
         ],
         description='Leave blank to use the filename'
@@ -64,33 +91,24 @@ class DocumentUploadForm(FlaskForm):
 class DocumentSearchForm(FlaskForm):
     """Form for searching/filtering documents"""
 
+    class Meta:
+        # Submitted via GET and changes nothing, so skip the CSRF token
+        csrf = False
+
     sort_by = SelectField(
         'Sort By',
-        choices=[
-            ('upload_date', 'Upload Date'),
-            ('original_filename', 'Name'),
-            ('file_size', 'File Size')
-        ],
+        choices=SORT_BY_CHOICES,
         default='upload_date'
     )
 
     order = SelectField(
         'Order',
-        choices=[
-            ('desc', 'Newest First'),
-            ('asc', 'Oldest First')
-        ],
+        choices=ORDER_CHOICES,
         default='desc'
     )
 
     file_type = SelectField(
         'File Type',
-        choices=[
-            ('all', 'All Types'),
-            ('pdf', 'PDF'),
-            ('txt', 'Text'),
-            ('epub', 'EPUB'),
-            ('docx', 'Word Document')
-        ],
+        choices=FILE_TYPE_CHOICES,
         default='all'
     )
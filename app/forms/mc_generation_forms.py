@@ -9,8 +9,44 @@ from wtforms import (
     IntegerField, HiddenField, SubmitField
 )
 from wtforms.validators import (
-    DataRequired, Length, NumberRange,
-    Optional, ValidationError
+    DataRequired, Length, NumberRange, ValidationError
+)
+from app.utils.validators import BoundedNonEmpty
+from app.forms.base_forms import REQUIRED, OPTIONAL, CONTROL_KW, SELECT_KW
+
+
+# Select field choices
+DIFFICULTY_CHOICES = (
+    (1, 'Beginner - Basic recall and definitions'),
+    (2, 'Easy - Simple application'),
+    (3, 'Medium - Understanding and analysis'),
+    (4, 'Advanced - Complex application'),
+    (5, 'Expert - Synthesis and evaluation')
+)
+
+SUBJECT_AREA_CHOICES = (
+    ('science', 'Science (Biology, Chemistry, Physics)'),
+    ('math', 'Mathematics'),
+    ('history', 'History'),
+    ('language', 'Language Arts'),
+    ('social_studies', 'Social Studies'),
+    ('computer_science', 'Computer Science'),
+    ('general', 'General Knowledge')
+)
+
+ANSWER_CHOICES = (
+    ('A', 'A'),
+    ('B', 'B'),
+    ('C', 'C'),
+    ('D', 'D')
+)
+
+MANUAL_DIFFICULTY_CHOICES = (
+    (1, 'Beginner'),
+    (2, 'Easy'),
+    (3, 'Medium'),
+    (4, 'Advanced'),
+    (5, 'Expert')
 )
 
 
@@ -20,8 +56,8 @@ class MCGenerationRequestForm(FlaskForm):
     topic = StringField(
         'Topic',
         validators=[
-            DataRequired(message='Topic is required'),
-            Length(min=3, max=200, message='Topic must be 3-200 characters')
+            BoundedNonEmpty(3, 200, 'Topic must be 3-200 characters',
+                            required_message='Topic is required')
         ],
         render_kw={
             'placeholder': 'e.g., Photosynthesis, World War II, Python Functions',
@@ -47,37 +83,23 @@ class MCGenerationRequestForm(FlaskForm):
 
     difficulty = SelectField(
         'Difficulty Level',
-        choices=[
-            (1, 'Beginner - Basic recall and definitions'),
-            (2, 'Easy - Simple application'),
-            (3, 'Medium - Understanding and analysis'),
-            (4, 'Advanced - Complex application'),
-            (5, 'Expert - Synthesis and evaluation')
-        ],
+        choices=DIFFICULTY_CHOICES,
         coerce=int,
         default=3,
-        render_kw={'class': 'form-select'}
+        render_kw=SELECT_KW
     )
 
     subject_area = SelectField(
         'Subject Area',
-        choices=[
-            ('science', 'Science (Biology, Chemistry, Physics)'),
-            ('math', 'Mathematics'),
-            ('history', 'History'),
-            ('language', 'Language Arts'),
-            ('social_studies', 'Social Studies'),
-            ('computer_science', 'Computer Science'),
-            ('general', 'General Knowledge')
-        ],
+        choices=SUBJECT_AREA_CHOICES,
         default='general',
-        render_kw={'class': 'form-select'}
+        render_kw=SELECT_KW
     )
 
     additional_context = TextAreaField(
         'Additional Instructions (Optional)',
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=500, message='Additional context must be less than 500 characters')
         ],
         render_kw={
@@ -87,96 +109,64 @@ class MCGenerationRequestForm(FlaskForm):
         }
     )
 
-    deck_id = HiddenField('Deck ID', validators=[DataRequired()])
+    deck_id = HiddenField('Deck ID', validators=[REQUIRED])
 
     submit = SubmitField('Generate Questions', render_kw={'class': 'btn btn-primary'})
 
 
-class MCQuestionEditForm(FlaskForm):
-    """Form for editing a single MC question in preview"""
+# Validators repeated across the MC forms
+QUESTION = BoundedNonEmpty(10, 1000, 'Question must be 10-1000 characters',
+                           required_message='Question is required')
+MISCONCEPTION_LENGTH = Length(max=500)
 
-    question_text = TextAreaField(
-        'Question',
-        validators=[
-            DataRequired(message='Question is required'),
-            Length(min=10, max=1000, message='Question must be 10-1000 characters')
-        ],
-        render_kw={
-            'class': 'form-control',
-            'rows': 3
-        }
-    )
 
-    choice_a = StringField(
-        'Choice A',
-        validators=[
-            DataRequired(message='Choice A is required'),
-            Length(min=1, max=500, message='Choice must be 1-500 characters')
-        ],
-        render_kw={'class': 'form-control'}
-    )
+class MCChoicesForm(FlaskForm):
+    """Answer choice, correct answer and misconception fields shared by the
+    MC edit and manual-create forms
 
-    choice_b = StringField(
-        'Choice B',
-        validators=[
-            DataRequired(message='Choice B is required'),
-            Length(min=1, max=500, message='Choice must be 1-500 characters')
-        ],
-        render_kw={'class': 'form-control'}
-    )
-
-    choice_c = StringField(
-        'Choice C',
-        validators=[
-            DataRequired(message='Choice C is required'),
-            Length(min=1, max=500, message='Choice must be 1-500 characters')
-        ],
-        render_kw={'class': 'form-control'}
-    )
-
-    choice_d = StringField(
-        'Choice D',
-        validators=[
-            DataRequired(message='Choice D is required'),
-            Length(min=1, max=500, message='Choice must be 1-500 characters')
-        ],
-        render_kw={'class': 'form-control'}
-    )
+    choice_a..d and misconception_a..d are added by _add_choice_fields()
+    below.
+    """
 
     correct_answer = SelectField(
         'Correct Answer',
-        choices=[
-            ('A', 'A'),
-            ('B', 'B'),
-            ('C', 'C'),
-            ('D', 'D')
-        ],
+        choices=ANSWER_CHOICES,
         validators=[DataRequired(message='Must select correct answer')],
-        render_kw={'class': 'form-select'}
+        render_kw=SELECT_KW
     )
 
-    misconception_a = TextAreaField(
-        'Why A is wrong (if not correct)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={'class': 'form-control', 'rows': 2}
-    )
 
-    misconception_b = TextAreaField(
-        'Why B is wrong (if not correct)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={'class': 'form-control', 'rows': 2}
-    )
+def _add_choice_fields(form_class):
+    """Attach choice_<x> and misconception_<x> fields for each answer letter"""
+    letters = [letter for letter, _ in ANSWER_CHOICES]
+    for letter in letters:
+        setattr(form_class, f'choice_{letter.lower()}', StringField(
+            f'Choice {letter}',
+            validators=[BoundedNonEmpty(1, 500, 'Choice must be 1-500 characters',
+                                        required_message=f'Choice {letter} is required')],
+            render_kw=CONTROL_KW
+        ))
+    for letter in letters:
+        setattr(form_class, f'misconception_{letter.lower()}', TextAreaField(
+            f'Why {letter} is wrong (if not correct)',
+            validators=[OPTIONAL, MISCONCEPTION_LENGTH],
+            render_kw={'class': 'form-control', 'rows': 2}
+        ))
 
-    misconception_c = TextAreaField(
-        'Why C is wrong (if not correct)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={'class': 'form-control', 'rows': 2}
-    )
 
-    misconception_d = TextAreaField(
-        'Why D is wrong (if not correct)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={'class': 'form-control', 'rows': 2}
+_add_choice_fields(MCChoicesForm)
+
+
+class MCQuestionEditForm(MCChoicesForm):
+    """Form for editing a single MC question in preview"""
+
+    question_text = TextAreaField(
+        'Question',
+        validators=[QUESTION],
+        render_kw={
+            'class': 'form-control',
+            'rows': 3
+        }
     )
 
     card_id = HiddenField('Card ID')
@@ -185,29 +175,23 @@ class MCQuestionEditForm(FlaskForm):
 
     def validate_choices(self, field):
         """Custom validator to ensure no duplicate choices"""
-        choices = [
-            self.choice_a.data,
-            self.choice_b.data,
-            self.choice_c.data,
-            self.choice_d.data
-        ]
-
-        # Remove None/empty values for comparison
-        choices = [c.strip().lower() for c in choices if c and c.strip()]
-
-        if len(choices) != len(set(choices)):
-            raise ValidationError('All choices must be different')
-
-
-class MCManualCreateForm(FlaskForm):
+        seen = set()
+        for choice in (self.choice_a.data, self.choice_b.data, self.choice_c.data, self.choice_d.data):
+            # Skip None/empty values; stop at the first duplicate
+            key = choice.strip().lower() if choice else ''
+            if not key:
+                continue
+            if key in seen:
+                raise ValidationError('All choices must be different')
+            seen.add(key)
+
+
+class MCManualCreateForm(MCChoicesForm):
     """Form for manually creating MC questions (fallback if AI fails)"""
 
     question_text = TextAreaField(
         'Question',
-        validators=[
-            DataRequired(message='Question is required'),
-            Length(min=10, max=1000, message='Question must be 10-1000 characters')
-        ],
+        validators=[QUESTION],
         render_kw={
             'class': 'form-control',
             'rows': 3,
@@ -215,117 +199,23 @@ class MCManualCreateForm(FlaskForm):
         }
     )
 
-    choice_a = StringField(
-        'Choice A',
-        validators=[
-            DataRequired(message='Choice A is required'),
-            Length(min=1, max=500)
-        ],
-        render_kw={'class': 'form-control', 'placeholder': 'First option'}
-    )
-
-    choice_b = StringField(
-        'Choice B',
-        validators=[
-            DataRequired(message='Choice B is required'),
-            Length(min=1, max=500)
-        ],
-        render_kw={'class': 'form-control', 'placeholder': 'Second option'}
-    )
-
-    choice_c = StringField(
-        'Choice C',
-        validators=[
-            DataRequired(message='Choice C is required'),
-            Length(min=1, max=500)
-        ],
-        render_kw={'class': 'form-control', 'placeholder': 'Third option'}
-    )
-
-    choice_d = StringField(
-        'Choice D',
-        validators=[
-            DataRequired(message='Choice D is required'),
-            Length(min=1, max=500)
-        ],
-        render_kw={'class': 'form-control', 'placeholder': 'Fourth option'}
-    )
-
-    correct_answer = SelectField(
-        'Correct Answer',
-        choices=[
-            ('A', 'A'),
-            ('B', 'B'),
-            ('C', 'C'),
-            ('D', 'D')
-        ],
-        validators=[DataRequired()],
-        render_kw={'class': 'form-select'}
-    )
-
     difficulty = SelectField(
         'Difficulty',
-        choices=[
-            (1, 'Beginner'),
-            (2, 'Easy'),
-            (3, 'Medium'),
-            (4, 'Advanced'),
-            (5, 'Expert')
-        ],
+        choices=MANUAL_DIFFICULTY_CHOICES,
         coerce=int,
         default=3,
-        render_kw={'class': 'form-select'}
-    )
-
-    misconception_a = TextAreaField(
-        'Explanation for A (if wrong)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={
-            'class': 'form-control',
-            'rows': 2,
-            'placeholder': 'Why someone might incorrectly choose A'
-        }
-    )
-
-    misconception_b = TextAreaField(
-        'Explanation for B (if wrong)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={
-            'class': 'form-control',
-            'rows': 2,
-            'placeholder': 'Why someone might incorrectly choose B'
-        }
-    )
-
-    misconception_c = TextAreaField(
-        'Explanation for C (if wrong)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={
-            'class': 'form-control',
-            'rows': 2,
-            'placeholder': 'Why someone might incorrectly choose C'
-        }
-    )
-
-    misconception_d = TextAreaField(
-        'Explanation for D (if wrong)',
-        validators=[Optional(), Length(max=500)],
-        render_kw={
-            'class': 'form-control',
-            'rows': 2,
-            'placeholder': 'Why someone might incorrectly choose D'
-        }
+        render_kw=SELECT_KW
     )
 
     concept_tags = StringField(
         'Concept Tags (comma-separated)',
-        validators=[Optional(), Length(max=200)],
+        validators=[OPTIONAL, Length(max=200)],
         render_kw={
             'class': 'form-control',
             'placeholder': 'e.g., photosynthesis, chloroplast, light reactions'
         }
     )
 
-    deck_id = HiddenField('Deck ID', validators=[DataRequired()])
+    deck_id = HiddenField('Deck ID', validators=[REQUIRED])
 
     submit = SubmitField('Create Question', render_kw={'class': 'btn btn-primary'})
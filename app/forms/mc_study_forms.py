@@ -9,7 +9,37 @@ from wtforms import (
     SubmitField, RadioField, IntegerField
 )
 from wtforms.validators import (
-    DataRequired, Optional, Length, NumberRange
+    DataRequired, Length, NumberRange
+)
+from app.forms.base_forms import REQUIRED, OPTIONAL, SELECT_KW, CHECK_KW
+
+
+# Select field choices
+ANSWER_CHOICES = (
+    ('A', 'A'),
+    ('B', 'B'),
+    ('C', 'C'),
+    ('D', 'D')
+)
+
+CONFIDENCE_CHOICES = (
+    (1, '1 - Guessing'),
+    (2, '2 - Uncertain'),
+    (3, '3 - Moderate'),
+    (4, '4 - Confident'),
+    (5, '5 - Certain')
+)
+
+FILTER_CHOICES = (
+    ('all', 'All Questions'),
+    ('new', 'New Questions Only'),
+    ('incorrect', 'Previously Incorrect'),
+    ('random', 'Random Selection')
+)
+
+SHUFFLE_CHOICES = (
+    ('yes', 'Shuffle (Random Order)'),
+    ('no', 'Original Order')
 )
 
 
@@ -19,7 +49,7 @@ class MCSessionStartForm(FlaskForm):
     session_title = StringField(
         'Session Title (Optional)',
         validators=[
-            Optional(),
+            OPTIONAL,
             Length(max=200, message='Title must be less than 200 characters')
         ],
         render_kw={
@@ -28,7 +58,7 @@ class MCSessionStartForm(FlaskForm):
         }
     )
 
-    deck_id = HiddenField('Deck ID', validators=[DataRequired()])
+    deck_id = HiddenField('Deck ID', validators=[REQUIRED])
 
     submit = SubmitField('Start Studying', render_kw={'class': 'btn btn-primary btn-lg'})
 
@@ -38,33 +68,25 @@ class MCAnswerSubmitForm(FlaskForm):
 
     selected_choice = RadioField(
         'Your Answer',
-        choices=[
-            ('A', 'A'),
-            ('B', 'B'),
-            ('C', 'C'),
-            ('D', 'D')
-        ],
+        choices=ANSWER_CHOICES,
         validators=[DataRequired(message='Please select an answer')],
-        render_kw={'class': 'form-check-input'}
+        render_kw=CHECK_KW
     )
 
-    confidence_rating = SelectField(
+    # Parsed with a single int() and range-checked; the template renders
+    # the 1-5 options from confidence_choices
+    confidence_rating = IntegerField(
         'Confidence Level',
-        choices=[
-            (1, '1 - Guessing'),
-            (2, '2 - Uncertain'),
-            (3, '3 - Moderate'),
-            (4, '4 - Confident'),
-            (5, '5 - Certain')
-        ],
-        coerce=int,
-        validators=[DataRequired(message='Please rate your confidence')],
-        render_kw={'class': 'form-select'}
+        validators=[
+            DataRequired(message='Please rate your confidence'),
+            NumberRange(min=1, max=5, message='Please rate your confidence')
+        ]
     )
+    confidence_choices = CONFIDENCE_CHOICES
 
     time_spent = HiddenField('Time Spent', default=0)
-    card_id = HiddenField('Card ID', validators=[DataRequired()])
-    session_id = HiddenField('Session ID', validators=[DataRequired()])
+    card_id = HiddenField('Card ID', validators=[REQUIRED])
+    session_id = HiddenField('Session ID', validators=[REQUIRED])
 
     submit = SubmitField('Submit Answer', render_kw={'class': 'btn btn-primary'})
 
@@ -72,7 +94,7 @@ class MCAnswerSubmitForm(FlaskForm):
 class MCFeedbackContinueForm(FlaskForm):
     """Simple form to continue to next question after feedback"""
 
-    session_id = HiddenField('Session ID', validators=[DataRequired()])
+    session_id = HiddenField('Session ID', validators=[REQUIRED])
 
     submit = SubmitField('Next Question', render_kw={'class': 'btn btn-success btn-lg'})
 
@@ -80,22 +102,21 @@ class MCFeedbackContinueForm(FlaskForm):
 class MCSessionFilterForm(FlaskForm):
     """Form for filtering which cards to study in a session"""
 
+    class Meta:
+        # Submitted via GET and changes nothing, so skip the CSRF token
+        csrf = False
+
     filter_by = SelectField(
         'Study Mode',
-        choices=[
-            ('all', 'All Questions'),
-            ('new', 'New Questions Only'),
-            ('incorrect', 'Previously Incorrect'),
-            ('random', 'Random Selection')
-        ],
+        choices=FILTER_CHOICES,
         default='all',
-        render_kw={'class': 'form-select'}
+        render_kw=SELECT_KW
     )
 
     max_questions = IntegerField(
         'Maximum Questions',
         validators=[
-            Optional(),
+            OPTIONAL,
             NumberRange(min=1, max=50, message='Must be between 1 and 50')
         ],
         render_kw={
@@ -106,12 +127,9 @@ class MCSessionFilterForm(FlaskForm):
 
     shuffle = SelectField(
         'Question Order',
-        choices=[
-            ('yes', 'Shuffle (Random Order)'),
-            ('no', 'Original Order')
-        ],
+        choices=SHUFFLE_CHOICES,
         default='yes',
-        render_kw={'class': 'form-select'}
+        render_kw=SELECT_KW
     )
 
     submit = SubmitField('Apply Filters', render_kw={'class': 'btn btn-secondary'})
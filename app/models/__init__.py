@@ -1,3 +1,7 @@
+# Models are imported eagerly on purpose: relationships are declared by
+# class name and several (User.ai_usage_logs, User.chat_sessions,
+# User.documents, ...) only exist as backrefs from the other side, so every
+# mapper must be registered before the first query and before db.create_all()
 from app.models.user import User
 from app.models.deck import Deck
 from app.models.flashcard import Flashcard
@@ -1,21 +1,43 @@
-from app.extensions import db
+import json
+import time
+from datetime import datetime, timedelta
+from flask import g, has_request_context
+from sqlalchemy import func
+from app.extensions import db, get_redis, redis
 from app.models.base import BaseModel
 
+# Key on flask.g for usage rows queued during the current request
+PENDING_USAGE_KEY = 'pending_ai_usage'
+
+# Sliding rate-limit window: one Redis counter per user per minute
+RATE_WINDOW_MINUTES = 60
+RATE_BUCKET_TTL = 3900  # seconds - the window plus some slack
+
+# Usage stats tolerate a little staleness, so Redis keeps them briefly
+USAGE_STATS_TTL = 60  # seconds
+
 
 class AIUsage(BaseModel):
     """Track AI API usage for billing and rate limiting"""
     __tablename__ = 'ai_usage_logs'
+    # Rate limiting and usage stats filter on user_id and a created_at range
+    __table_args__ = (
+        db.Index('idx_ai_usage_user_time', 'user_id', 'created_at'),
+    )
 
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     operation_type = db.Column(db.String(50), nullable=False)  # 'generate_cards', 'enhance_card', 'hint', 'tag_suggest'
     tokens_used = db.Column(db.Integer, default=0)
     cost = db.Column(db.Numeric(10, 6), default=0.0)  # Cost in USD
     success = db.Column(db.Boolean, default=True)
-    error_message = db.Column(db.Text, nullable=True)
+
+    # Free-text and JSON columns are only read when debugging, so they are
+    # deferred; opt in with .options(undefer(...)) or undefer_group('payload')
+    error_message = db.deferred(db.Column(db.Text, nullable=True))
 
     # Store request details for debugging
-    request_data = db.Column(db.Text, nullable=True)  # JSON string of request
-    response_data = db.Column(db.Text, nullable=True)  # JSON string of response
+    request_data = db.deferred(db.Column(db.Text, nullable=True), group='payload')  # JSON string of request
+    response_data = db.deferred(db.Column(db.Text, nullable=True), group='payload')  # JSON string of response
 
     # Relationships
     user = db.relationship('User', backref=db.backref('ai_usage_logs', lazy='dynamic'))
@@ -38,13 +60,75 @@ class AIUsage(BaseModel):
         )
         db.session.add(log)
         db.session.commit()
+        AIUsage._count_request(user_id)
         return log
 
+    @staticmethod
+    def queue_usage(user_id, operation_type, tokens_used=0, cost=0.0, success=True, error_message=None, request_data=None, response_data=None):
+        """Queue a usage log entry to be inserted when the request finishes"""
+        if not has_request_context():
+            # No after_request hook will flush outside a request (CLI, jobs)
+            return AIUsage.log_usage(user_id, operation_type, tokens_used, cost, success,
+                                     error_message, request_data, response_data)
+        g.setdefault(PENDING_USAGE_KEY, []).append({
+            'user_id': user_id,
+            'operation_type': operation_type,
+            'tokens_used': tokens_used,
+            'cost': cost,
+            'success': success,
+            'error_message': error_message,
+            'request_data': request_data,
+            'response_data': response_data,
+            # Stamp the call time, not the flush time, for rate limiting
+            'created_at': datetime.utcnow()
+        })
+        AIUsage._count_request(user_id)
+
+    @staticmethod
+    def _count_request(user_id):
+        """Bump the user's current-minute rate-limit bucket in Redis, if configured"""
+        client = get_redis()
+        if client is None:
+            return
+        key = f'rl:{user_id}:{int(time.time()) // 60}'
+        try:
+            client.pipeline().incr(key).expire(key, RATE_BUCKET_TTL).execute()
+        except redis.RedisError as e:
+            print(f"Rate limit counter update failed: {e}")
+
+    @staticmethod
+    def flush_pending():
+        """Insert the usage entries queued during this request in one batch
+
+        Runs on its own connection and transaction, so it never commits
+        whatever the request left pending in db.session.
+        """
+        rows = g.get(PENDING_USAGE_KEY)
+        if not rows:
+            return
+        with db.engine.begin() as conn:
+            conn.execute(AIUsage.__table__.insert(), rows)
+        g.pop(PENDING_USAGE_KEY, None)
+
+    @staticmethod
+    def _pending_count(user_id):
+        """Number of usage entries this request has queued for a user"""
+        if not has_request_context():
+            return 0
+        return sum(1 for row in g.get(PENDING_USAGE_KEY, ()) if row['user_id'] == user_id)
+
     @staticmethod
     def get_user_usage_stats(user_id, days=30):
         """Get usage statistics for a user over the last N days"""
-        from datetime import datetime, timedelta
-        from sqlalchemy import func
+        client = get_redis()
+        cache_key = f'usage_stats:{user_id}:{days}'
+        if client is not None:
+            try:
+                cached = client.get(cache_key)
+                if cached is not None:
+                    return json.loads(cached)
+            except redis.RedisError as e:
+                print(f"Usage stats cache read failed: {e}")
 
         cutoff_date = datetime.utcnow() - timedelta(days=days)
 
@@ -58,7 +142,7 @@ class AIUsage(BaseModel):
             AIUsage.created_at >= cutoff_date
         ).group_by(AIUsage.operation_type).all()
 
-        return {
+        usage = {
             stat.operation_type: {
                 'count': stat.count,
                 'total_tokens': stat.total_tokens or 0,
@@ -67,10 +151,27 @@ class AIUsage(BaseModel):
             for stat in stats
         }
 
+        if client is not None:
+            try:
+                client.setex(cache_key, USAGE_STATS_TTL, json.dumps(usage))
+            except redis.RedisError as e:
+                print(f"Usage stats cache write failed: {e}")
+
+        return usage
+
     @staticmethod
     def get_hourly_request_count(user_id):
         """Get number of requests in the last hour for rate limiting"""
-        from datetime import datetime, timedelta
+        # Sum the per-minute Redis buckets when available, so the check
+        # doesn't touch the database
+        client = get_redis()
+        if client is not None:
+            minute = int(time.time()) // 60
+            keys = [f'rl:{user_id}:{m}' for m in range(minute - RATE_WINDOW_MINUTES + 1, minute + 1)]
+            try:
+                return sum(int(v) for v in client.mget(keys) if v)
+            except redis.RedisError as e:
+                print(f"Rate limit counter read failed, counting in SQL: {e}")
 
         one_hour_ago = datetime.utcnow() - timedelta(hours=1)
 
@@ -79,4 +180,5 @@ class AIUsage(BaseModel):
             AIUsage.created_at >= one_hour_ago
         ).count()
 
-        return count
+        # Calls made earlier in this request are not inserted yet
+        return count + AIUsage._pending_count(user_id)
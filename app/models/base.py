@@ -23,7 +23,15 @@ class BaseModel(db.Model):
 
     def to_dict(self):
         """Convert model instance to dictionary"""
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        return {name: getattr(self, name) for name in self._column_names()}
+
+    @classmethod
+    def _column_names(cls):
+        """Column names of this model's table, computed once per class"""
+        # Looked up in the class's own __dict__ so subclasses don't inherit
+        # a parent's cached names
+        names = cls.__dict__.get('_cached_column_names')
+        if names is None:
+            names = tuple(column.name for column in cls.__table__.columns)
+            cls._cached_column_names = names
+        return names
@@ -8,6 +8,11 @@ from sqlalchemy import Enum
 import enum
 
 
+def estimate_text_tokens(text):
+    """Rough token estimate for text: 1 token per 4 characters"""
+    return len(text) // 4
+
+
 class MessageRole(enum.Enum):
     """Enumeration for message roles in chat"""
     USER = 'user'
@@ -15,6 +20,42 @@ class MessageRole(enum.Enum):
     SYSTEM = 'system'
 
 
+# Role -> plain string value, keyed by both the enum member and its value so
+# messages built with a string role (before a flush) resolve the same way
+ROLE_VALUES = {role: role.value for role in MessageRole}
+ROLE_VALUES.update({value: value for value in list(ROLE_VALUES.values())})
+
+# Gemini uses 'model' instead of 'assistant'
+GEMINI_ROLES = {'user': 'user', 'assistant': 'model', 'system': 'system'}
+
+MONTH_ABBR = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def format_chat_timestamp(timestamp, now):
+    """
+    Format a message timestamp relative to now, without strftime.
+
+    Returns:
+        str: "02:30 PM" for today, "Jan 15, 02:30 PM" for this year,
+             otherwise "Jan 15 2023, 02:30 PM"
+    """
+    hour = timestamp.hour % 12 or 12
+    clock = f"{hour:02d}:{timestamp.minute:02d} {'PM' if timestamp.hour >= 12 else 'AM'}"
+
+    # If message is from today, show only time
+    if timestamp.year == now.year and timestamp.month == now.month and timestamp.day == now.day:
+        return clock
+
+    # If from this year, show month/day and time
+    day = f"{MONTH_ABBR[timestamp.month - 1]} {timestamp.day:02d}"
+    if timestamp.year == now.year:
+        return f"{day}, {clock}"
+
+    # Otherwise show full date
+    return f"{day} {timestamp.year}, {clock}"
+
+
 class ChatMessage(db.Model):
     """
     Represents a single message in a chat conversation.
@@ -22,6 +63,10 @@ class ChatMessage(db.Model):
     """
 
     __tablename__ = 'chat_messages'
+    # History is always read per session in timestamp order
+    __table_args__ = (
+        db.Index('idx_chat_messages_session_time', 'session_id', 'timestamp'),
+    )
 
     # Primary Key
     id = db.Column(db.Integer, primary_key=True)
@@ -43,9 +88,13 @@ class ChatMessage(db.Model):
     error_message = db.Column(db.Text, nullable=True)
 
     def __repr__(self):
-        role_name = self.role.value if isinstance(self.role, MessageRole) else self.role
         content_preview = self.content[:50] + '...' if len(self.content) > 50 else self.content
-        return f'<ChatMessage {self.id}: {role_name} - {content_preview}>'
+        return f'<ChatMessage {self.id}: {self.role_value} - {content_preview}>'
+
+    @property
+    def role_value(self):
+        """Role as its string value: 'user', 'assistant' or 'system'"""
+        return ROLE_VALUES.get(self.role, self.role)
 
     def estimate_tokens(self):
         """
@@ -57,7 +106,7 @@ class ChatMessage(db.Model):
         """
         if self.tokens_used > 0:
             return self.tokens_used
-        return len(self.content) // 4
+        return estimate_text_tokens(self.content)
 
     def format_for_gemini(self):
         """
@@ -66,69 +115,70 @@ class ChatMessage(db.Model):
         Returns:
             dict: Message in Gemini's expected format
         """
-        role_value = self.role.value if isinstance(self.role, MessageRole) else self.role
-
-        # Gemini uses 'model' instead of 'assistant'
-        gemini_role = 'model' if role_value == 'assistant' else role_value
-
+        role_value = self.role_value
         return {
-            'role': gemini_role,
+            'role': GEMINI_ROLES.get(role_value, role_value),
             'parts': [{'text': self.content}]
         }
 
     def is_from_user(self):
         """Check if message is from user"""
-        role_value = self.role.value if isinstance(self.role, MessageRole) else self.role
-        return role_value == 'user'
+        return self.role_value == 'user'
 
     def is_from_assistant(self):
         """Check if message is from AI assistant"""
-        role_value = self.role.value if isinstance(self.role, MessageRole) else self.role
-        return role_value == 'assistant'
+        return self.role_value == 'assistant'
 
     def is_system_message(self):
         """Check if message is a system message"""
-        role_value = self.role.value if isinstance(self.role, MessageRole) else self.role
-        return role_value == 'system'
+        return self.role_value == 'system'
 
-    def get_formatted_timestamp(self):
+    def get_formatted_timestamp(self, now=None):
         """
         Get human-readable timestamp.
 
+        Args:
+            now (datetime): Reference time; pass one shared value when
+                formatting many messages
+
         Returns:
             str: Formatted timestamp (e.g., "2:30 PM" or "Jan 15, 2:30 PM")
         """
-        now = datetime.utcnow()
+        return format_chat_timestamp(self.timestamp, now or datetime.utcnow())
 
-        # If message is from today, show only time
-        if self.timestamp.date() == now.date():
-            return self.timestamp.strftime('%I:%M %p')
+    @staticmethod
+    def format_timestamps_batch(messages):
+        """
+        Format timestamps for a list of messages against a single 'now'.
 
-        # If from this year, show month/day and time
-        if self.timestamp.year == now.year:
-            return self.timestamp.strftime('%b %d, %I:%M %p')
+        Args:
+            messages (list): ChatMessage objects
 
-        # Otherwise show full date
-        return self.timestamp.strftime('%b %d %Y, %I:%M %p')
+        Returns:
+            list: Formatted timestamps in the same order
+        """
+        now = datetime.utcnow()
+        return [format_chat_timestamp(msg.timestamp, now) for msg in messages]
 
-    def to_dict(self):
+    def to_dict(self, now=None):
         """
         Convert message to dictionary for API responses.
 
+        Args:
+            now (datetime): Reference time for formatted_timestamp
+
         Returns:
             dict: Message data
         """
-        role_value = self.role.value if isinstance(self.role, MessageRole) else self.role
-
         return {
             'id': self.id,
             'session_id': self.session_id,
-            'role': role_value,
+            'role': self.role_value,
             'content': self.content,
             'tokens_used': self.tokens_used,
             'model_used': self.model_used,
             'timestamp': self.timestamp.isoformat(),
-            'formatted_timestamp': self.get_formatted_timestamp(),
+            'formatted_timestamp': self.get_formatted_timestamp(now),
             'has_error': self.has_error,
             'error_message': self.error_message
         }
@@ -149,6 +199,7 @@ class ChatMessage(db.Model):
             session_id=session_id,
             role=MessageRole.USER,
             content=content,
+            tokens_used=estimate_text_tokens(content),
             timestamp=datetime.utcnow()
         )
 
@@ -170,7 +221,7 @@ class ChatMessage(db.Model):
             session_id=session_id,
             role=MessageRole.ASSISTANT,
             content=content,
-            tokens_used=tokens_used,
+            tokens_used=tokens_used or estimate_text_tokens(content),
             model_used=model_used,
             timestamp=datetime.utcnow()
         )
@@ -191,6 +242,7 @@ class ChatMessage(db.Model):
             session_id=session_id,
             role=MessageRole.SYSTEM,
             content=content,
+            tokens_used=estimate_text_tokens(content),
             timestamp=datetime.utcnow()
         )
 
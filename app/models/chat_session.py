@@ -3,6 +3,7 @@ Chat Session Model - Stores conversation containers
 """
 
 from datetime import datetime
+from sqlalchemy import case, func
 from app.models.base import BaseModel
 from app.extensions import db
 
@@ -50,10 +51,35 @@ class ChatSession(BaseModel):
         """
         return self.messages.order_by(ChatMessage.timestamp.asc()).limit(limit).all()
 
+    def build_gemini_context(self, limit=20):
+        """
+        Build the conversation history for a Gemini request.
+        Fetches only role and content of the most recent non-system messages
+        in one query and formats them without loading ChatMessage objects.
+
+        Args:
+            limit (int): Maximum number of messages to include
+
+        Returns:
+            list: Messages in Gemini's format, oldest first
+        """
+        rows = db.session.query(
+            ChatMessage.role, ChatMessage.content
+        ).filter(
+            ChatMessage.session_id == self.id,
+            ChatMessage.role != MessageRole.SYSTEM
+        ).order_by(ChatMessage.timestamp.desc()).limit(limit).all()
+
+        return [
+            {'role': GEMINI_ROLES[role.value], 'parts': [{'text': content}]}
+            for role, content in reversed(rows)
+        ]
+
     def calculate_context_tokens(self, message_limit=20):
         """
         Calculate approximate token count for recent conversation history.
-        Uses rough estimate of 1 token per 4 characters.
+        Sums each message's stored tokens_used in SQL, falling back to the
+        1 token per 4 characters estimate for rows stored without one.
 
         Args:
             message_limit (int): Number of recent messages to include
@@ -61,19 +87,44 @@ class ChatSession(BaseModel):
         Returns:
             int: Estimated token count
         """
-        messages = self.get_recent_messages(limit=message_limit)
-        total_chars = sum(len(msg.content) for msg in messages)
-        return total_chars // 4  # Rough token estimate
+        # Same rows as get_recent_messages()
+        recent = db.session.query(
+            ChatMessage.tokens_used, ChatMessage.content
+        ).filter(
+            ChatMessage.session_id == self.id
+        ).order_by(ChatMessage.timestamp.asc()).limit(message_limit).subquery()
+
+        tokens = case(
+            (recent.c.tokens_used > 0, recent.c.tokens_used),
+            else_=func.length(recent.c.content) // 4
+        )
+        return db.session.query(func.coalesce(func.sum(tokens), 0)).scalar()
+
+    # The mutators below leave committing to the caller, so one chat turn is
+    # a single transaction
 
     def update_last_message_time(self):
         """Update the last_message_at timestamp to current time"""
         self.last_message_at = datetime.utcnow()
-        db.session.commit()
 
     def increment_message_count(self):
         """Increment the message counter"""
         self.message_count += 1
-        db.session.commit()
+
+    def record_messages(self, count=1, tokens=0):
+        """
+        Add messages and tokens to the session counters and stamp last_message_at.
+        Runs as one UPDATE so concurrent requests cannot lose increments.
+
+        Args:
+            count (int): Number of messages added
+            tokens (int): Number of tokens those messages used
+        """
+        ChatSession.query.filter_by(id=self.id).update({
+            ChatSession.message_count: ChatSession.message_count + count,
+            ChatSession.total_tokens_used: ChatSession.total_tokens_used + tokens,
+            ChatSession.last_message_at: datetime.utcnow()
+        })
 
     def add_tokens_used(self, tokens):
         """
@@ -83,20 +134,24 @@ class ChatSession(BaseModel):
             tokens (int): Number of tokens to add
         """
         self.total_tokens_used += tokens
-        db.session.commit()
 
     def generate_title_from_first_message(self):
         """
         Generate a title from the first user message if title is still 'New Chat'.
         Returns the first 50 characters of the first message.
         """
-        if self.title == 'New Chat' and self.message_count > 0:
-            first_message = self.messages.filter_by(role='user').first()
-            if first_message:
-                # Take first 50 chars and add ellipsis if longer
-                content = first_message.content.strip()
-                self.title = content[:50] + ('...' if len(content) > 50 else '')
-                db.session.commit()
+        if self.title != 'New Chat' or self.message_count == 0:
+            return
+
+        content = db.session.query(ChatMessage.content).filter(
+            ChatMessage.session_id == self.id,
+            ChatMessage.role == MessageRole.USER
+        ).order_by(ChatMessage.timestamp.asc()).limit(1).scalar()
+
+        if content:
+            # Take first 50 chars and add ellipsis if longer
+            content = content.strip()
+            self.title = content[:50] + ('...' if len(content) > 50 else '')
 
     def attach_document(self, document_id):
         """
@@ -106,12 +161,10 @@ class ChatSession(BaseModel):
             document_id (int): ID of the document to attach
         """
         self.document_id = document_id
-        db.session.commit()
 
     def detach_document(self):
         """Remove document attachment from this session"""
         self.document_id = None
-        db.session.commit()
 
     def has_document(self):
         """Check if this session has an attached document"""
@@ -170,4 +223,4 @@ class ChatSession(BaseModel):
 
 
 # Import ChatMessage to avoid circular import issues
-from app.models.chat_message import ChatMessage
+from app.models.chat_message import ChatMessage, MessageRole, GEMINI_ROLES
@@ -1,8 +1,44 @@
-from app.extensions import db
+import json
+from app.extensions import db, get_redis, redis
 from app.models.base import BaseModel
-from sqlalchemy import func, case, or_
+from app.models.flashcard import Flashcard
+from app.models.mc_card import MCCard
+from sqlalchemy import event, func, case, and_, or_, inspect
+from sqlalchemy.orm import Session, load_only
 from datetime import datetime, timedelta
 
+# Deck statistics are cached in Redis (when REDIS_URL is set) and dropped
+# whenever one of the deck's cards is written; the TTL bounds how stale
+# time-based figures such as due_today can get
+DECK_STATS_TTL = 300  # seconds
+DECK_STATS_KINDS = ('cards', 'difficulty')
+
+
+def _deck_stats_key(deck_id, kind):
+    return f'deck_stats:{deck_id}:{kind}'
+
+
+def _cached_deck_stats(deck_id, kind, compute):
+    """Return compute() for this deck, through the Redis cache if configured"""
+    client = get_redis()
+    if client is None:
+        return compute()
+
+    key = _deck_stats_key(deck_id, kind)
+    try:
+        cached = client.get(key)
+        if cached is not None:
+            return json.loads(cached)
+    except redis.RedisError as e:
+        print(f"Deck stats cache read failed: {e}")
+
+    value = compute()
+    try:
+        client.setex(key, DECK_STATS_TTL, json.dumps(value))
+    except redis.RedisError as e:
+        print(f"Deck stats cache write failed: {e}")
+    return value
+
 
 class Deck(BaseModel):
     __tablename__ = 'decks'
@@ -18,6 +54,10 @@ class Deck(BaseModel):
     flashcards = db.relationship('Flashcard', backref='deck', lazy=True, cascade='all, delete-orphan')
     mc_cards = db.relationship('MCCard', backref='deck', lazy=True, cascade='all, delete-orphan')  # NEW
 
+    # Filled in by listing queries via DeckService.with_card_count()
+    card_count = db.query_expression()
+    mc_card_count = db.query_expression()
+
     def __repr__(self):
         return f'<Deck {self.name}>'
 
@@ -27,21 +67,35 @@ class Deck(BaseModel):
 
     def get_card_count(self):
         """Get number of flashcards in this deck"""
-        return len(self.flashcards)
+        # Reuse a count or collection the listing query already loaded,
+        # otherwise COUNT in SQL instead of loading every card
+        if self.card_count is not None:
+            return self.card_count
+        if 'flashcards' in self.__dict__:
+            return len(self.flashcards)
+        return db.session.query(func.count(Flashcard.id)).filter(
+            Flashcard.deck_id == self.id
+        ).scalar()
 
     def get_mc_card_count(self):
         """Get number of MC cards in this deck"""
-        return len(self.mc_cards)
+        if self.mc_card_count is not None:
+            return self.mc_card_count
+        if 'mc_cards' in self.__dict__:
+            return len(self.mc_cards)
+        return db.session.query(func.count(MCCard.id)).filter(
+            MCCard.deck_id == self.id
+        ).scalar()
 
     def can_be_studied(self):
         """Check if deck has cards to study"""
         return self.get_card_count() > 0 or self.get_mc_card_count() > 0
 
     def get_next_card_for_study(self):
-        """Get the next card for study session (simple implementation)"""
-        if self.flashcards:
-            return self.flashcards[0]  # For MVP, just return first card
-        return None
+        """Get the next card for study session: the one due soonest"""
+        return Flashcard.query.filter_by(deck_id=self.id).order_by(
+            Flashcard.next_review_date.asc().nullsfirst()
+        ).first()
 
     def to_dict_summary(self):
         """Convert to dictionary with summary info"""
@@ -58,14 +112,21 @@ class Deck(BaseModel):
     # Rest of the class remains the same...
     def search_cards(self, query=None, learning_state=None, difficulty=None,
                      sort_by='created_desc', date_from=None, date_to=None):
-        from app.models.flashcard import Flashcard
-        cards_query = Flashcard.query.filter_by(deck_id=self.id)
+        # Only the columns the card list shows; generation_prompt and the
+        # other AI fields stay unloaded
+        cards_query = Flashcard.query.filter_by(deck_id=self.id).options(load_only(
+            Flashcard.front_text, Flashcard.back_text, Flashcard.learning_state,
+            Flashcard.ease_factor, Flashcard.times_studied, Flashcard.times_correct,
+            Flashcard.next_review_date, Flashcard.created_at
+        ))
         if query:
-            search_term = f"%{query.lower()}%"
+            # ILIKE can use the PostgreSQL trigram indexes from
+            # add_flashcard_indexes.py; SQLite renders it as lower() LIKE lower()
+            search_term = f"%{query}%"
             cards_query = cards_query.filter(
                 or_(
-                    func.lower(Flashcard.front_text).like(search_term),
-                    func.lower(Flashcard.back_text).like(search_term)
+                    Flashcard.front_text.ilike(search_term),
+                    Flashcard.back_text.ilike(search_term)
                 )
             )
         if learning_state:
@@ -80,15 +141,12 @@ class Deck(BaseModel):
         return cards_query
 
     def _apply_difficulty_filter(self, query, difficulty):
-        from app.models.flashcard import Flashcard
-        accuracy = case(
-            (Flashcard.times_studied > 0,
-             (Flashcard.times_correct * 100.0) / Flashcard.times_studied),
-            else_=100.0
-        )
+        # Unstudied cards have accuracy 0 but count as easy, not hard
+        accuracy = Flashcard.accuracy
         if difficulty == 'easy':
             query = query.filter(
                 or_(
+                    Flashcard.times_studied == 0,
                     accuracy >= 80,
                     Flashcard.ease_factor > 2.5
                 )
@@ -103,19 +161,14 @@ class Deck(BaseModel):
         elif difficulty == 'hard':
             query = query.filter(
                 or_(
-                    accuracy < 50,
+                    and_(Flashcard.times_studied > 0, accuracy < 50),
                     Flashcard.ease_factor < 2.0
                 )
             )
         return query
 
     def _apply_sorting(self, query, sort_by):
-        from app.models.flashcard import Flashcard
-        accuracy = case(
-            (Flashcard.times_studied > 0,
-             (Flashcard.times_correct * 100.0) / Flashcard.times_studied),
-            else_=0.0
-        )
+        accuracy = Flashcard.accuracy
         sort_options = {
             'created_desc': Flashcard.created_at.desc(),
             'created_asc': Flashcard.created_at.asc(),
@@ -133,14 +186,18 @@ class Deck(BaseModel):
         return query.order_by(sort_expression)
 
     def get_cards_by_state(self, state):
-        from app.models.flashcard import Flashcard
         return Flashcard.query.filter_by(
             deck_id=self.id,
             learning_state=state
         ).all()
 
     def get_cards_statistics(self):
-        from app.models.flashcard import Flashcard
+        return _cached_deck_stats(self.id, 'cards', self._query_cards_statistics)
+
+    def get_difficulty_distribution(self):
+        return _cached_deck_stats(self.id, 'difficulty', self._query_difficulty_distribution)
+
+    def _query_cards_statistics(self):
         stats = {
             'total': 0,
             'new': 0,
@@ -152,49 +209,68 @@ class Deck(BaseModel):
             'avg_difficulty': 0.0,
             'total_studied': 0
         }
-        cards = Flashcard.query.filter_by(deck_id=self.id).all()
-        if not cards:
+
+        def count_where(condition):
+            return func.sum(case((condition, 1), else_=0))
+
+        state = Flashcard.learning_state
+        # Same rule as Flashcard.is_due_for_review()
+        is_due = or_(state == 'new', Flashcard.next_review_date <= datetime.utcnow())
+        # Aggregates scan the whole deck anyway, so they compute accuracy
+        # inline rather than depend on the accuracy column's migration
+        accuracy = case(
+            (Flashcard.times_studied > 0,
+             (Flashcard.times_correct * 100.0) / Flashcard.times_studied)
+        )
+        row = db.session.query(
+            func.count(Flashcard.id),
+            count_where(state == 'new'),
+            count_where(state == 'learning'),
+            count_where(state == 'review'),
+            count_where(state == 'mastered'),
+            count_where(is_due),
+            func.sum(Flashcard.times_studied),
+            func.avg(accuracy),
+            func.avg(Flashcard.ease_factor)
+        ).filter(Flashcard.deck_id == self.id).one()
+
+        total, new, learning, review, mastered, due, studied, avg_accuracy, avg_ease = row
+        if not total:
             return stats
-        today = datetime.utcnow()
-        stats['total'] = len(cards)
-        stats['new'] = sum(1 for c in cards if c.learning_state == 'new')
-        stats['learning'] = sum(1 for c in cards if c.learning_state == 'learning')
-        stats['review'] = sum(1 for c in cards if c.learning_state == 'review')
-        stats['mastered'] = sum(1 for c in cards if c.learning_state == 'mastered')
-        stats['due_today'] = sum(1 for c in cards if c.is_due_for_review())
-        stats['total_studied'] = sum(c.times_studied for c in cards)
-        studied_cards = [c for c in cards if c.times_studied > 0]
-        if studied_cards:
-            total_accuracy = sum(
-                (c.times_correct / c.times_studied * 100)
-                for c in studied_cards
-            )
-            stats['avg_accuracy'] = round(total_accuracy / len(studied_cards), 1)
-        stats['avg_difficulty'] = round(
-            sum(c.ease_factor for c in cards) / len(cards), 1
-        ) if cards else 0
+        stats.update(
+            total=total,
+            new=new,
+            learning=learning,
+            review=review,
+            mastered=mastered,
+            due_today=due,
+            total_studied=studied or 0,
+            avg_difficulty=round(avg_ease, 1)
+        )
+        # AVG skips the NULLs the CASE yields for unstudied cards
+        if avg_accuracy is not None:
+            stats['avg_accuracy'] = round(avg_accuracy, 1)
         return stats
 
-    def get_difficulty_distribution(self):
-        from app.models.flashcard import Flashcard
-        cards = Flashcard.query.filter_by(deck_id=self.id).all()
+    def _query_difficulty_distribution(self):
         distribution = {
             'easy': 0,
             'medium': 0,
             'hard': 0,
             'unstudied': 0
         }
-        for card in cards:
-            if card.times_studied == 0:
-                distribution['unstudied'] += 1
-            else:
-                accuracy = (card.times_correct / card.times_studied) * 100
-                if accuracy >= 80 or card.ease_factor > 2.5:
-                    distribution['easy'] += 1
-                elif accuracy >= 50 or card.ease_factor >= 2.0:
-                    distribution['medium'] += 1
-                else:
-                    distribution['hard'] += 1
+        # Inline for the same reason as _query_cards_statistics()
+        accuracy = (Flashcard.times_correct * 100.0) / Flashcard.times_studied
+        bucket = case(
+            (Flashcard.times_studied == 0, 'unstudied'),
+            (or_(accuracy >= 80, Flashcard.ease_factor > 2.5), 'easy'),
+            (or_(accuracy >= 50, Flashcard.ease_factor >= 2.0), 'medium'),
+            else_='hard'
+        )
+        rows = db.session.query(bucket, func.count(Flashcard.id)).filter(
+            Flashcard.deck_id == self.id
+        ).group_by(bucket).all()
+        distribution.update(rows)
         return distribution
 
     def to_dict_detailed(self):
@@ -212,3 +288,47 @@ class Deck(BaseModel):
             'user_id': self.user_id,
             'mc_card_count': self.get_mc_card_count()
         }
+
+
+# Session.info key for deck ids whose cached stats go stale on commit
+STALE_DECK_STATS_KEY = 'stale_deck_stats'
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_stale_deck_stats(session, flush_context):
+    """Note every deck whose cards this flush wrote, including a moved card's old deck"""
+    deck_ids = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if not isinstance(obj, Flashcard):
+            continue
+        deck_ids.add(obj.deck_id)
+        deck_ids.update(inspect(obj).attrs.deck_id.history.deleted)
+    deck_ids.discard(None)
+    if deck_ids:
+        session.info.setdefault(STALE_DECK_STATS_KEY, set()).update(deck_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_deck_stats(session):
+    """Drop cached statistics for decks whose card writes were just committed"""
+    # Deleting at flush time would let a read before the commit re-cache old numbers
+    deck_ids = session.info.pop(STALE_DECK_STATS_KEY, None)
+    if not deck_ids:
+        return
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.delete(*(
+            _deck_stats_key(deck_id, kind)
+            for deck_id in deck_ids
+            for kind in DECK_STATS_KINDS
+        ))
+    except redis.RedisError as e:
+        print(f"Deck stats cache invalidation failed: {e}")
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_stale_deck_stats(session):
+    """Rolled-back card writes leave the cached statistics valid"""
+    session.info.pop(STALE_DECK_STATS_KEY, None)
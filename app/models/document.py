@@ -1,7 +1,13 @@
 from datetime import datetime, timedelta
+from flask import g, has_request_context
 from app.models.base import BaseModel
 from app.extensions import db
 
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+# Key on flask.g for documents opened during the current request
+ACCESSED_IDS_KEY = 'accessed_document_ids'
+
 
 class Document(BaseModel):
     """Model for storing uploaded document metadata"""
@@ -51,9 +57,33 @@ class Document(BaseModel):
         return os.path.join(Config.UPLOAD_FOLDER, self.file_path)
 
     def mark_accessed(self):
-        """Update last accessed timestamp"""
-        self.last_accessed = datetime.utcnow()
-        db.session.commit()
+        """Queue a last_accessed update for when the request finishes"""
+        if not has_request_context():
+            # No after_request hook will flush outside a request (CLI, jobs)
+            Document._stamp_accessed([self.id])
+            return
+        g.setdefault(ACCESSED_IDS_KEY, set()).add(self.id)
+
+    @staticmethod
+    def flush_accessed():
+        """Stamp last_accessed on every document opened during this request"""
+        ids = g.pop(ACCESSED_IDS_KEY, None)
+        if ids:
+            Document._stamp_accessed(ids)
+
+    @staticmethod
+    def _stamp_accessed(ids):
+        """Stamp last_accessed for the given ids in one UPDATE"""
+        # Own connection and transaction, so db.session is never committed with it
+        table = Document.__table__
+        with db.engine.begin() as conn:
+            conn.execute(
+                table.update()
+                .where(table.c.id.in_(list(ids)))
+                .values(last_accessed=datetime.utcnow())
+            )
+
+    # The status helpers below leave committing to the caller
 
     def update_gemini_info(self, file_uri, file_name, expires_at):
         """Update Gemini File API information"""
@@ -62,22 +92,20 @@ class Document(BaseModel):
         self.gemini_expires_at = expires_at
         self.processing_status = 'ready'
         self.error_message = None
-        db.session.commit()
 
     def mark_error(self, error_message):
         """Mark document processing as failed"""
         self.processing_status = 'error'
         self.error_message = error_message
-        db.session.commit()
 
     def get_file_size_formatted(self):
         """Return human-readable file size"""
         size = self.file_size
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.1f} {unit}"
-            size /= 1024.0
-        return f"{size:.1f} TB"
+        if size < 1024:
+            return f"{size:.1f} B"
+        # Each unit is 2**10 of the previous, so the bit length picks it directly
+        index = min((size.bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
+        return f"{size / (1 << (10 * index)):.1f} {FILE_SIZE_UNITS[index]}"
 
     def to_dict(self):
         """Convert to dictionary for JSON responses"""
@@ -3,8 +3,31 @@ from app.extensions import db
 from app.models.base import BaseModel
 
 
+def sm2_ease_change(quality):
+    """SM-2 ease factor adjustment: EF' = EF + (0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))"""
+    return 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+
+
+# Ease change for each valid quality rating (0-5), folded once at import
+EASE_CHANGE = tuple(sm2_ease_change(quality) for quality in range(6))
+
+# Fixed intervals (days) for the first two successful reviews
+FIRST_INTERVALS = {0: 1, 1: 6}
+
 class Flashcard(BaseModel):
     __tablename__ = 'flashcards'
+    # Deck statistics count by state, study queues pick due cards per deck,
+    # and the card list filters/sorts by creation date or ease within a deck
+    __table_args__ = (
+        db.Index('idx_flashcards_deck_state', 'deck_id', 'learning_state'),
+        db.Index('idx_flashcards_deck_review', 'deck_id', 'next_review_date'),
+        db.Index('idx_flashcards_deck_created', 'deck_id', 'created_at'),
+        db.Index('idx_flashcards_deck_ease', 'deck_id', 'ease_factor'),
+        db.Index('idx_flashcards_deck_accuracy', 'deck_id', 'accuracy'),
+    )
+    # Don't fetch the computed accuracy back after INSERT/UPDATE (RETURNING),
+    # so writes also work before add_flashcard_accuracy.py has been run
+    __mapper_args__ = {'eager_defaults': False}
 
     # ========== ORIGINAL FIELDS (Unchanged) ==========
     front_text = db.Column(db.Text, nullable=False)
@@ -13,6 +36,16 @@ class Flashcard(BaseModel):
     times_studied = db.Column(db.Integer, default=0)
     times_correct = db.Column(db.Integer, default=0)
 
+    # Percent correct (0 when never studied), kept by the database so card
+    # lists can filter and sort on it through idx_flashcards_deck_accuracy.
+    # Read-only; get_accuracy() still works on unsaved changes. Deferred so
+    # plain card loads keep working on databases that predate the column
+    # (see add_flashcard_accuracy.py).
+    accuracy = db.deferred(db.Column(db.Float, db.Computed(
+        "CASE WHEN times_studied > 0 THEN times_correct * 100.0 / times_studied ELSE 0 END",
+        persisted=True
+    )))
+
     # ========== SM-2 SPACED REPETITION FIELDS ==========
     ease_factor = db.Column(db.Float, default=2.5)  # How "easy" card is (1.3-3.0)
     interval = db.Column(db.Integer, default=0)  # Days until next review
@@ -80,19 +113,19 @@ class Flashcard(BaseModel):
 
     # ========== SM-2 SPACED REPETITION METHODS ==========
 
-    def is_due_for_review(self):
-        """Check if card is due for review today"""
+    def is_due_for_review(self, now=None):
+        """Check if card is due for review today (pass now to share one clock read)"""
         if self.learning_state == 'new':
             return True
-        return datetime.utcnow() >= self.next_review_date
+        return (now or datetime.utcnow()) >= self.next_review_date
 
-    def days_until_due(self):
+    def days_until_due(self, now=None):
         """Calculate days until card is due for review"""
         if self.learning_state == 'new':
             return 0
         if not self.next_review_date:
             return 0
-        delta = self.next_review_date - datetime.utcnow()
+        delta = self.next_review_date - (now or datetime.utcnow())
         return max(0, delta.days)
 
     def process_sm2_review(self, quality):
@@ -137,19 +170,13 @@ class Flashcard(BaseModel):
             self.interval = 0
             self.learning_state = 'learning'
         else:
-            # CORRECT: Advance to next interval
-            if self.repetitions == 0:
-                # First successful review: 1 day
-                self.interval = 1
-                self.learning_state = 'learning'
-            elif self.repetitions == 1:
-                # Second successful review: 6 days
-                self.interval = 6
-                self.learning_state = 'review'
-            else:
-                # Subsequent reviews: multiply by ease factor
+            # CORRECT: 1 day, then 6 days, then multiply by ease factor
+            first_interval = FIRST_INTERVALS.get(self.repetitions)
+            if first_interval is None:
                 self.interval = round(self.interval * self.ease_factor)
-                self.learning_state = 'review'
+            else:
+                self.interval = first_interval
+            self.learning_state = 'learning' if self.repetitions == 0 else 'review'
 
             self.repetitions += 1
 
@@ -157,9 +184,11 @@ class Flashcard(BaseModel):
             if self.interval > 21:
                 self.learning_state = 'mastered'
 
-        # Update ease factor based on quality
-        # Formula: EF' = EF + (0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
-        ease_change = 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        # Update ease factor based on quality (see sm2_ease_change)
+        if 0 <= quality < len(EASE_CHANGE):
+            ease_change = EASE_CHANGE[quality]
+        else:
+            ease_change = sm2_ease_change(quality)
         self.ease_factor = max(1.3, self.ease_factor + ease_change)
 
         # Calculate next review date
@@ -210,12 +239,14 @@ class Flashcard(BaseModel):
 
     # ========== ENHANCED to_dict METHOD ==========
 
-    def to_dict(self):
+    def to_dict(self, now=None):
         """
         Convert flashcard to dictionary representation
 
         Includes both original fields and new SM-2 fields for complete data export.
+        Pass now when serializing many cards so they share one reference time.
         """
+        now = now or datetime.utcnow()
         return {
             # Original fields
             'id': self.id,
@@ -241,6 +272,6 @@ class Flashcard(BaseModel):
             'ai_provider': self.ai_provider,
 
             # Computed fields
-            'is_due': self.is_due_for_review(),
-            'days_until_due': self.days_until_due()
+            'is_due': self.is_due_for_review(now),
+            'days_until_due': self.days_until_due(now)
         }
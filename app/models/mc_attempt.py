@@ -1,6 +1,14 @@
 from app.extensions import db
 from app.models.base import BaseModel
 from datetime import datetime
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Query
+
+# Confidence rating (1-5) -> label; index 0 stands for no rating
+CONFIDENCE_LABELS = ('Unknown', 'Guessing', 'Uncertain', 'Moderate', 'Confident', 'Certain')
+
+# "0 seconds" ... "59 seconds", built once for get_time_formatted()
+SECONDS_TEXT = tuple(f"{n} second{'s' if n != 1 else ''}" for n in range(60))
 
 
 class MCAttempt(BaseModel):
@@ -30,32 +38,27 @@ class MCAttempt(BaseModel):
 
     def get_confidence_label(self):
         """Get human-readable confidence label"""
-        if not self.confidence_rating:
-            return 'Unknown'
-
-        labels = {
-            1: 'Guessing',
-            2: 'Uncertain',
-            3: 'Moderate',
-            4: 'Confident',
-            5: 'Certain'
-        }
-        return labels.get(self.confidence_rating, 'Unknown')
+        rating = self.confidence_rating or 0
+        if 0 < rating < len(CONFIDENCE_LABELS):
+            return CONFIDENCE_LABELS[rating]
+        return 'Unknown'
 
     def get_time_formatted(self):
         """Get formatted time spent (e.g., '45 seconds', '1 minute 23 seconds')"""
         seconds = self.time_spent_seconds
 
+        if 0 <= seconds < 60:
+            return SECONDS_TEXT[seconds]
         if seconds < 60:
-            return f"{seconds} second{'s' if seconds != 1 else ''}"
+            return f"{seconds} seconds"
 
-        minutes = seconds // 60
-        remaining_seconds = seconds % 60
+        minutes, remaining_seconds = divmod(seconds, 60)
+        minutes_text = f"{minutes} minute{'s' if minutes != 1 else ''}"
 
         if remaining_seconds == 0:
-            return f"{minutes} minute{'s' if minutes != 1 else ''}"
+            return minutes_text
 
-        return f"{minutes} minute{'s' if minutes != 1 else ''} {remaining_seconds} second{'s' if remaining_seconds != 1 else ''}"
+        return f"{minutes_text} {SECONDS_TEXT[remaining_seconds]}"
 
     def was_overconfident(self):
         """
@@ -125,44 +128,75 @@ class MCAttempt(BaseModel):
         Calculate calibration statistics for a collection of attempts
 
         Args:
-            attempts: List of MCAttempt objects
+            attempts: List of MCAttempt objects, or a query over them (counted
+                in one SQL aggregate without loading the rows)
 
         Returns:
             Dict with calibration metrics
         """
-        if not attempts:
-            return {
-                'total_attempts': 0,
-                'overconfident_count': 0,
-                'underconfident_count': 0,
-                'well_calibrated_count': 0,
-                'avg_confidence': 0.0
-            }
-
-        attempts_with_confidence = [a for a in attempts if a.confidence_rating]
+        if isinstance(attempts, Query):
+            counts = MCAttempt._calibration_counts_sql(attempts)
+        else:
+            counts = MCAttempt._calibration_counts(attempts)
+        total, rated, overconfident, underconfident, well_calibrated, confidence_sum = counts
 
-        if not attempts_with_confidence:
+        if not total or not rated:
             return {
-                'total_attempts': len(attempts),
+                'total_attempts': total,
                 'overconfident_count': 0,
                 'underconfident_count': 0,
                 'well_calibrated_count': 0,
                 'avg_confidence': 0.0
             }
 
-        overconfident = sum(1 for a in attempts_with_confidence if a.was_overconfident())
-        underconfident = sum(1 for a in attempts_with_confidence if a.was_underconfident())
-        well_calibrated = sum(1 for a in attempts_with_confidence if a.is_well_calibrated())
-        avg_confidence = sum(a.confidence_rating for a in attempts_with_confidence) / len(attempts_with_confidence)
-
         return {
-            'total_attempts': len(attempts),
-            'attempts_with_confidence': len(attempts_with_confidence),
+            'total_attempts': total,
+            'attempts_with_confidence': rated,
             'overconfident_count': overconfident,
             'underconfident_count': underconfident,
             'well_calibrated_count': well_calibrated,
-            'avg_confidence': round(avg_confidence, 1),
-            'overconfident_percentage': round((overconfident / len(attempts_with_confidence)) * 100, 1),
-            'underconfident_percentage': round((underconfident / len(attempts_with_confidence)) * 100, 1),
-            'well_calibrated_percentage': round((well_calibrated / len(attempts_with_confidence)) * 100, 1)
+            'avg_confidence': round(confidence_sum / rated, 1),
+            'overconfident_percentage': round((overconfident / rated) * 100, 1),
+            'underconfident_percentage': round((underconfident / rated) * 100, 1),
+            'well_calibrated_percentage': round((well_calibrated / rated) * 100, 1)
         }
+
+    @staticmethod
+    def _calibration_counts(attempts):
+        """Single pass over loaded attempts, same rules as the was_*/is_* methods"""
+        total = rated = overconfident = underconfident = well_calibrated = confidence_sum = 0
+        for attempt in attempts:
+            total += 1
+            confidence = attempt.confidence_rating
+            if not confidence:
+                continue
+            rated += 1
+            confidence_sum += confidence
+            if attempt.is_correct:
+                underconfident += confidence <= 2
+                well_calibrated += confidence >= 3
+            else:
+                overconfident += confidence >= 4
+                well_calibrated += confidence <= 3
+        return total, rated, overconfident, underconfident, well_calibrated, confidence_sum
+
+    @staticmethod
+    def _calibration_counts_sql(query):
+        """The same counts as _calibration_counts(), as one aggregate over the query"""
+        confidence = MCAttempt.confidence_rating
+        correct = MCAttempt.is_correct.is_(True)
+        wrong = MCAttempt.is_correct.is_(False)
+
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        total, rated, overconfident, underconfident, well_calibrated, confidence_sum = query.with_entities(
+            func.count(MCAttempt.id),
+            count_where(confidence > 0),
+            count_where(and_(confidence >= 4, wrong)),
+            count_where(and_(confidence.between(1, 2), correct)),
+            count_where(or_(and_(confidence >= 3, correct),
+                            and_(confidence.between(1, 3), wrong))),
+            func.coalesce(func.sum(case((confidence > 0, confidence), else_=0)), 0)
+        ).order_by(None).one()
+        return total, rated, overconfident, underconfident, well_calibrated, confidence_sum
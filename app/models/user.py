@@ -1,5 +1,6 @@
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import func
 from app.extensions import db
 from app.models.base import BaseModel
 
@@ -36,7 +37,11 @@ class User(UserMixin, BaseModel):
 
     def get_total_cards(self):
         """Get total number of cards across all decks"""
-        return sum(len(deck.flashcards) for deck in self.decks)
+        from app.models.deck import Deck
+        from app.models.flashcard import Flashcard
+        return db.session.query(func.count(Flashcard.id)).join(Deck).filter(
+            Deck.user_id == self.id
+        ).scalar()
 
     def has_ai_access(self):
         """Check if user has access to AI features"""
@@ -109,21 +109,11 @@ def format_conversation_history(messages, include_system=False):
     formatted = []
 
     for msg in messages:
-        # Get role value (handle both enum and string)
-        from app.models.chat_message import MessageRole
-        role_value = msg.role.value if isinstance(msg.role, MessageRole) else msg.role
-
         # Skip system messages unless requested
-        if role_value == 'system' and not include_system:
+        if msg.role_value == 'system' and not include_system:
             continue
 
-        # Gemini uses 'model' instead of 'assistant'
-        gemini_role = 'model' if role_value == 'assistant' else role_value
-
-        formatted.append({
-            'role': gemini_role,
-            'parts': [{'text': msg.content}]
-        })
+        formatted.append(msg.format_for_gemini())
 
     return formatted
 
@@ -271,7 +261,7 @@ def format_message_for_display(message):
     """
     return {
         'id': message.id,
-        'role': message.role.value if hasattr(message.role, 'value') else message.role,
+        'role': message.role_value,
         'content': message.content,
         'timestamp': message.get_formatted_timestamp(),
         'tokens': message.tokens_used,
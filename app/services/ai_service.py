@@ -111,7 +111,7 @@ class AIService:
 
             # Log success
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='generate_cards',
                     tokens_used=provider.estimate_tokens(topic) * count,
@@ -123,7 +123,7 @@ class AIService:
         except Exception as e:
             # Log failure
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='generate_cards',
                     success=False,
@@ -164,7 +164,7 @@ class AIService:
 
             # Log usage
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='enhance_card',
                     tokens_used=provider.estimate_tokens(front_text + back_text),
@@ -175,7 +175,7 @@ class AIService:
 
         except Exception as e:
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='enhance_card',
                     success=False,
@@ -216,7 +216,7 @@ class AIService:
 
             # Log usage
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='hint_generation',
                     tokens_used=provider.estimate_tokens(card_front + card_back),
@@ -227,7 +227,7 @@ class AIService:
 
         except Exception as e:
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='hint_generation',
                     success=False,
@@ -268,7 +268,7 @@ class AIService:
 
             # Log usage
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='tag_suggestion',
                     tokens_used=provider.estimate_tokens(card_front + card_back),
@@ -279,7 +279,7 @@ class AIService:
 
         except Exception as e:
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='tag_suggestion',
                     success=False,
@@ -325,7 +325,7 @@ class AIService:
 
             # Log usage
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='chat_response',
                     tokens_used=response.get('tokens_used', 0),
@@ -343,7 +343,7 @@ class AIService:
         except Exception as e:
             # Log failure
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='chat_response',
                     success=False,
@@ -395,7 +395,7 @@ class AIService:
 
             # Log usage
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='document_chat',
                     tokens_used=response.get('tokens_used', 0),
@@ -412,7 +412,7 @@ class AIService:
         except Exception as e:
             # Log failure
             if user_id:
-                AIUsage.log_usage(
+                AIUsage.queue_usage(
                     user_id=user_id,
                     operation_type='document_chat',
                     success=False,
@@ -1,4 +1,6 @@
 from flask_login import login_user, logout_user
+from sqlalchemy import or_, select
+from app.extensions import db
 from app.models import User
 from app.services.base_service import BaseService
 
@@ -10,10 +12,11 @@ class AuthService(BaseService):
     def register_user(cls, username, email, password):
         """Register a new user"""
         # Check if user already exists
-        if cls.exists(username=username):
+        username_taken, email_taken = cls.find_taken(username, email)
+        if username_taken:
             return None, "Username already exists"
 
-        if cls.exists(email=email):
+        if email_taken:
             return None, "Email already registered"
 
         # Create new user
@@ -23,6 +26,19 @@ class AuthService(BaseService):
 
         return user, "Registration successful"
 
+    @classmethod
+    def find_taken(cls, username, email):
+        """Return (username_taken, email_taken) using a single query"""
+        rows = db.session.execute(
+            select(User.username, User.email)
+            .where(or_(User.username == username, User.email == email))
+            .limit(2)
+        ).all()
+        return (
+            any(row.username == username for row in rows),
+            any(row.email == email for row in rows)
+        )
+
     @classmethod
     def authenticate_user(cls, username_or_email, password):
         """Authenticate user with username/email and password"""
@@ -5,6 +5,7 @@ Business logic for AI chat functionality
 
 from datetime import datetime
 from sqlalchemy import desc, or_
+from sqlalchemy.orm import selectinload
 from app.extensions import db
 from app.models import ChatSession, ChatMessage, Document, User
 from app.services.gemini_file_service import GeminiFileService
@@ -64,7 +65,6 @@ class ChatService:
         """
         from app.services.ai_service import AIService
         from app.services.ai_providers.chat_prompts import (
-            format_conversation_history,
             get_base_system_prompt,
             get_document_aware_prompt
         )
@@ -102,8 +102,7 @@ class ChatService:
             db.session.flush()
 
             # Get conversation history
-            history = session.get_recent_messages(limit=20)
-            formatted_history = format_conversation_history(history)
+            formatted_history = session.build_gemini_context(limit=20)
 
             # Get system prompt
             if document_context:
@@ -140,16 +139,15 @@ class ChatService:
                 db.session.add(assistant_msg)
 
                 # Update session statistics
-                session.message_count += 2
-                session.total_tokens_used += user_msg.tokens_used + assistant_msg.tokens_used
-                session.update_last_message_time()
+                session.record_messages(2, user_msg.tokens_used + assistant_msg.tokens_used)
 
                 db.session.commit()
 
+                now = datetime.utcnow()
                 return {
                     'success': True,
-                    'user_message': user_msg.to_dict(),
-                    'assistant_message': assistant_msg.to_dict(),
+                    'user_message': user_msg.to_dict(now),
+                    'assistant_message': assistant_msg.to_dict(now),
                     'session': {
                         'message_count': session.message_count,
                         'total_tokens': session.total_tokens_used
@@ -223,7 +221,11 @@ class ChatService:
             list: List of chat sessions
         """
         try:
-            query = ChatSession.query.filter_by(user_id=user_id)
+            # Session lists show the attached document's name, so load all
+            # of them in one extra SELECT instead of one per session
+            query = ChatSession.query.filter_by(user_id=user_id).options(
+                selectinload(ChatSession.document)
+            )
 
             # Apply search filter
             if search:
@@ -1,8 +1,9 @@
-from app.models import Deck, Flashcard
+from app.models import Deck, Flashcard, MCCard
 from app.services.base_service import BaseService
 from app.extensions import db
 from datetime import datetime, timedelta
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import with_expression
 
 
 class DeckService(BaseService):
@@ -23,15 +24,33 @@ class DeckService(BaseService):
         )
         return deck
 
+    @staticmethod
+    def with_card_count(query):
+        """Load each deck's flashcard and MC card counts in the same SELECT as the decks"""
+        card_count = select(func.count(Flashcard.id)).where(
+            Flashcard.deck_id == Deck.id
+        ).scalar_subquery()
+        mc_card_count = select(func.count(MCCard.id)).where(
+            MCCard.deck_id == Deck.id
+        ).scalar_subquery()
+        return query.options(
+            with_expression(Deck.card_count, card_count),
+            with_expression(Deck.mc_card_count, mc_card_count)
+        )
+
     @classmethod
     def get_user_decks(cls, user_id, page=1, per_page=12):
         """Get all decks for a specific user with pagination"""
-        return cls.get_paginated(page=page, per_page=per_page, user_id=user_id)
+        return cls.with_card_count(Deck.query.filter_by(user_id=user_id)).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
 
     @classmethod
     def get_public_decks(cls, page=1, per_page=12):
         """Get all public decks with pagination"""
-        return cls.get_paginated(page=page, per_page=per_page, is_public=True)
+        return cls.with_card_count(Deck.query.filter_by(is_public=True)).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
 
     @classmethod
     def get_deck_with_cards(cls, deck_id):
@@ -97,7 +116,14 @@ class DeckService(BaseService):
     @classmethod
     def get_deck_statistics(cls, deck):
         """Get comprehensive statistics for a deck"""
-        if not deck.flashcards:
+        total_cards, total_studies, total_correct, avg_ease = db.session.query(
+            func.count(Flashcard.id),
+            func.sum(Flashcard.times_studied),
+            func.sum(Flashcard.times_correct),
+            func.avg(Flashcard.ease_factor)
+        ).filter(Flashcard.deck_id == deck.id).one()
+
+        if not total_cards:
             return {
                 'total_cards': 0,
                 'avg_difficulty': 0,
@@ -105,13 +131,10 @@ class DeckService(BaseService):
                 'avg_accuracy': 0
             }
 
-        total_cards = len(deck.flashcards)
-        total_studies = sum(card.times_studied for card in deck.flashcards)
-        total_correct = sum(card.times_correct for card in deck.flashcards)
-
+        total_studies = total_studies or 0
         # Use ease_factor as difficulty indicator (lower = harder)
-        avg_difficulty = sum(card.ease_factor for card in deck.flashcards) / total_cards
-        avg_accuracy = (total_correct / total_studies * 100) if total_studies > 0 else 0
+        avg_difficulty = avg_ease or 0
+        avg_accuracy = ((total_correct or 0) / total_studies * 100) if total_studies > 0 else 0
 
         return {
             'total_cards': total_cards,
@@ -142,7 +165,7 @@ class DeckService(BaseService):
                 search_filter & (Deck.is_public == True)
             )
 
-        return deck_query.all()
+        return cls.with_card_count(deck_query).all()
 
     # ============================================================================
     # NEW: SEARCH & FILTER METHODS FOR CARDS
@@ -272,16 +295,16 @@ class DeckService(BaseService):
         if not query or len(query) < 2:
             return []
 
-        search_term = f"%{query.lower()}%"
+        search_term = f"%{query}%"
 
         results = db.session.query(
             Flashcard.id,
-            Flashcard.front
+            Flashcard.front_text
         ).filter(
             Flashcard.deck_id == deck_id,
             or_(
-                func.lower(Flashcard.front).like(search_term),
-                func.lower(Flashcard.back).like(search_term)
+                Flashcard.front_text.ilike(search_term),
+                Flashcard.back_text.ilike(search_term)
             )
         ).limit(10).all()
 
@@ -370,9 +393,10 @@ class DeckService(BaseService):
         if not deck:
             return None
 
+        now = datetime.utcnow()
         export_data = {
             'deck': deck.to_dict_detailed() if include_stats else deck.to_dict_summary(),
-            'cards': [card.to_dict() for card in deck.flashcards]
+            'cards': [card.to_dict(now) for card in deck.flashcards]
         }
 
         return export_data
@@ -142,7 +142,7 @@ class DocumentQAService:
             if HAS_AI_USAGE:
                 try:
                     tokens_used = response.get('tokens_used', 0)
-                    AIUsage.log_usage(
+                    AIUsage.queue_usage(
                         user_id=user_id,
                         operation_type='document_mc_generation',
                         tokens_used=tokens_used,
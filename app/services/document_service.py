@@ -121,6 +121,7 @@ class DocumentService:
 
             if file_uri:
                 document.update_gemini_info(file_uri, file_name, expires_at)
+                db.session.commit()
                 print(f"✓ Document created successfully: ID {document.id}")
                 print(f"  Status: {document.processing_status}")
                 return document
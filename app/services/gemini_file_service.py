@@ -6,6 +6,7 @@ Handles file uploads and management with Google's Gemini File API
 import google.generativeai as genai
 from datetime import datetime, timedelta
 from app.config import Config
+from app.extensions import db
 import os
 import time
 import traceback
@@ -207,14 +208,18 @@ class GeminiFileService:
 
             if file_uri:
                 document.update_gemini_info(file_uri, file_name, expires_at)
+                db.session.commit()
                 return True
             else:
                 document.mark_error(error_msg or "Failed to refresh Gemini cache")
+                db.session.commit()
                 return False
 
         except Exception as e:
             print(f"Error refreshing file cache: {e}")
+            db.session.rollback()
             document.mark_error(f"Cache refresh error: {str(e)}")
+            db.session.commit()
             return False
 
     def list_all_files(self):
@@ -92,7 +92,7 @@ class MCGeneratorService:
             if HAS_AI_USAGE:
                 try:
                     tokens_used = ai_provider.estimate_tokens(prompt + response_text)
-                    AIUsage.log_usage(
+                    AIUsage.queue_usage(
                         user_id=user_id,
                         operation_type='mc_generation',  # FIXED: Changed from 'feature' to 'operation_type'
                         tokens_used=tokens_used,
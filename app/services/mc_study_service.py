@@ -7,6 +7,7 @@ from typing import List, Dict, Optional
 from datetime import datetime
 from app.models import MCCard, MCSession, MCAttempt
 from app.extensions import db
+from sqlalchemy.orm import joinedload
 import random
 
 
@@ -177,7 +178,7 @@ class MCStudyService:
         Returns:
             Dict with feedback information
         """
-        attempt = MCAttempt.query.get(attempt_id)
+        attempt = MCAttempt.query.options(joinedload(MCAttempt.card)).get(attempt_id)
         if not attempt:
             return {'success': False, 'error': 'Attempt not found'}
 
@@ -1,6 +1,7 @@
 import random
 from datetime import datetime, timedelta
-from sqlalchemy import and_
+from sqlalchemy import and_, func
+from app.extensions import db
 from app.models import Flashcard
 from app.services.base_service import BaseService
 
@@ -43,19 +44,15 @@ class StudyService(BaseService):
 
     @classmethod
     def bulk_create_flashcards(cls, deck_id, cards_data):
-        """Create multiple flashcards at once"""
-        created_cards = []
-
-        for card_data in cards_data:
-            if 'front_text' in card_data and 'back_text' in card_data:
-                card = cls.create_flashcard(
-                    deck_id=deck_id,
-                    front_text=card_data['front_text'],
-                    back_text=card_data['back_text']
-                )
-                created_cards.append(card)
-
-        return created_cards
+        """Create multiple flashcards at once from CardIn entries"""
+        return [
+            cls.create_flashcard(
+                deck_id=deck_id,
+                front_text=card_data.front_text,
+                back_text=card_data.back_text
+            )
+            for card_data in cards_data
+        ]
 
     # ========== SM-2 SPACED REPETITION CORE METHODS ==========
 
@@ -109,6 +106,30 @@ class StudyService(BaseService):
 
         return due_cards
 
+    @staticmethod
+    def count_due_cards_by_deck(deck_ids):
+        """
+        Count cards due for review in several decks with one grouped query.
+        Uses the same due rule as get_due_cards().
+
+        Args:
+            deck_ids (list): Deck IDs
+
+        Returns:
+            dict: deck_id -> due card count (decks with none are omitted)
+        """
+        if not deck_ids:
+            return {}
+
+        rows = db.session.query(
+            Flashcard.deck_id, func.count(Flashcard.id)
+        ).filter(
+            Flashcard.deck_id.in_(deck_ids),
+            Flashcard.next_review_date <= datetime.utcnow()
+        ).group_by(Flashcard.deck_id).all()
+
+        return dict(rows)
+
     @classmethod
     def get_new_cards(cls, deck_id, limit=None):
         """Get cards that have never been studied"""
@@ -310,7 +331,14 @@ class StudyService(BaseService):
         Returns:
             dict: Complete statistics including SM-2 metrics
         """
-        cards = cls.get_deck_cards(deck_id)
+        # Only the numeric/state columns, not front_text/back_text
+        cards = db.session.query(
+            Flashcard.learning_state,
+            Flashcard.times_studied,
+            Flashcard.times_correct,
+            Flashcard.ease_factor,
+            Flashcard.next_review_date
+        ).filter(Flashcard.deck_id == deck_id).all()
 
         if not cards:
             return {
@@ -338,7 +366,12 @@ class StudyService(BaseService):
         learning_cards = len([c for c in cards if c.learning_state == 'learning'])
         review_cards = len([c for c in cards if c.learning_state == 'review'])
         mastered_cards = len([c for c in cards if c.learning_state == 'mastered'])
-        due_today = len([c for c in cards if c.is_due_for_review()])
+        now = datetime.utcnow()
+        # Same rule as Flashcard.is_due_for_review()
+        due_today = len([
+            c for c in cards
+            if c.learning_state == 'new' or (c.next_review_date and now >= c.next_review_date)
+        ])
 
         # Accuracy statistics
         total_correct = sum(c.times_correct for c in cards)
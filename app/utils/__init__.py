@@ -6,7 +6,7 @@ from app.utils.helpers import (
 )
 from app.utils.validators import (
     UniqueUsername, UniqueEmail, StrongPassword, NoHtml,
-    CleanText, ValidFlashcardText, BulkCardsFormat
+    CleanText, ValidFlashcardText, BoundedNonEmpty, BulkCardsFormat
 )
 
 __all__ = [
@@ -33,5 +33,6 @@ __all__ = [
     'NoHtml',
     'CleanText',
     'ValidFlashcardText',
+    'BoundedNonEmpty',
     'BulkCardsFormat'
 ]
@@ -1,5 +1,14 @@
 import re
-from wtforms.validators import ValidationError
+from wtforms.validators import StopValidation, ValidationError
+
+
+# Patterns are compiled once at import instead of going through re's cache
+# on every validation call
+UPPERCASE_RE = re.compile(r'[A-Z]')
+LOWERCASE_RE = re.compile(r'[a-z]')
+DIGIT_RE = re.compile(r'[0-9]')
+SYMBOL_RE = re.compile(r'[!@#$%^&*(),.?":{}|<>]')
+HTML_TAG_RE = re.compile(r'<[^>]*>')
 
 
 class UniqueUsername:
@@ -58,16 +67,16 @@ class StrongPassword:
         if len(password) < self.min_length:
             raise ValidationError(self.message)
 
-        if self.require_uppercase and not re.search(r'[A-Z]', password):
+        if self.require_uppercase and not UPPERCASE_RE.search(password):
             raise ValidationError(self.message)
 
-        if self.require_lowercase and not re.search(r'[a-z]', password):
+        if self.require_lowercase and not LOWERCASE_RE.search(password):
             raise ValidationError(self.message)
 
-        if self.require_numbers and not re.search(r'[0-9]', password):
+        if self.require_numbers and not DIGIT_RE.search(password):
             raise ValidationError(self.message)
 
-        if self.require_symbols and not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+        if self.require_symbols and not SYMBOL_RE.search(password):
             raise ValidationError(self.message)
 
 
@@ -79,7 +88,7 @@ class NoHtml:
         self.message = message
 
     def __call__(self, form, field):
-        if field.data and re.search(r'<[^>]*>', field.data):
+        if field.data and HTML_TAG_RE.search(field.data):
             raise ValidationError(self.message)
 
 
@@ -87,6 +96,7 @@ class CleanText:
     """Validator to ensure text doesn't contain excessive whitespace or special chars"""
     def __init__(self, max_consecutive_spaces=2, message=None):
         self.max_consecutive_spaces = max_consecutive_spaces
+        self.pattern = re.compile(f' {{{max_consecutive_spaces + 1},}}')
         if not message:
             message = f'Text cannot contain more than {max_consecutive_spaces} consecutive spaces.'
         self.message = message
@@ -94,7 +104,7 @@ class CleanText:
     def __call__(self, form, field):
         if field.data:
             # Check for excessive consecutive spaces
-            if re.search(f' {{{self.max_consecutive_spaces + 1},}}', field.data):
+            if self.pattern.search(field.data):
                 raise ValidationError(self.message)
 
 
@@ -122,6 +132,37 @@ class ValidFlashcardText:
                 raise ValidationError('Text appears to be repetitive or invalid.')
 
 
+class BoundedNonEmpty:
+    """DataRequired and Length in one validator, measuring the text once"""
+    def __init__(self, min=-1, max=-1, message=None, required_message=None):
+        self.min = min
+        self.max = max
+        self.message = message or self._build_message()
+        self.required_message = required_message or 'This field is required.'
+        self.field_flags = {'required': True}
+        if min != -1:
+            self.field_flags['minlength'] = min
+        if max != -1:
+            self.field_flags['maxlength'] = max
+
+    def _build_message(self):
+        if self.max == -1:
+            return f'Field must be at least {self.min} characters long.'
+        if self.min == -1:
+            return f'Field cannot be longer than {self.max} characters.'
+        return f'Field must be between {self.min} and {self.max} characters long.'
+
+    def __call__(self, form, field):
+        data = field.data
+        if not data or (isinstance(data, str) and not data.strip()):
+            field.errors[:] = []
+            raise StopValidation(self.required_message)
+
+        length = len(data)
+        if length < self.min or (self.max != -1 and length > self.max):
+            raise ValidationError(self.message)
+
+
 class BulkCardsFormat:
     """Validator for bulk flashcards format"""
     def __init__(self, min_cards=1, max_cards=100, message=None):
@@ -133,15 +174,12 @@ class BulkCardsFormat:
         if not field.data:
             raise ValidationError(self.message)
 
-        lines = field.data.strip().split('\n')
-        valid_cards = 0
-
-        for line in lines:
-            line = line.strip()
-            if line and '|' in line:
-                parts = line.split('|', 1)
-                if len(parts) == 2 and parts[0].strip() and parts[1].strip():
-                    valid_cards += 1
+        # Same line format as BulkFlashcardForm.parse_cards()
+        parts = (line.partition('|') for line in field.data.splitlines())
+        valid_cards = sum(
+            1 for front, sep, back in parts
+            if sep and front.strip() and back.strip()
+        )
 
         if valid_cards < self.min_cards or valid_cards > self.max_cards:
             raise ValidationError(self.message)
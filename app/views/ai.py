@@ -4,6 +4,7 @@ from app.models import Deck
 from app.services.ai_service import AIService
 from app.services import StudyService
 from app.forms.ai_forms import AIGenerateCardsForm
+from app.forms.deck_forms import CardIn
 from app.config import Config
 
 ai_bp = Blueprint('ai', __name__, url_prefix='/ai')
@@ -56,13 +57,13 @@ def generate_cards(deck_id):
                 print(f"Sample card data: {cards_data[0] if cards_data else 'None'}")
 
                 # Convert 'front'/'back' to 'front_text'/'back_text' if needed
-                transformed_cards = []
-                for card in cards_data:
-                    transformed_card = {
-                        'front_text': card.get('front') or card.get('front_text', ''),
-                        'back_text': card.get('back') or card.get('back_text', '')
-                    }
-                    transformed_cards.append(transformed_card)
+                transformed_cards = [
+                    CardIn(
+                        card.get('front') or card.get('front_text', ''),
+                        card.get('back') or card.get('back_text', '')
+                    )
+                    for card in cards_data
+                ]
 
                 created_cards = StudyService.bulk_create_flashcards(
                     deck_id=deck.id,
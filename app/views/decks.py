@@ -112,6 +112,9 @@ def view(id):
     difficulty_dist = DeckService.get_deck_difficulty_distribution(id)
     study_stats = StudyService.get_study_statistics(deck.id)
 
+    # Only the cards the page shows, rather than the whole deck.flashcards collection
+    recent_cards = Flashcard.query.filter_by(deck_id=id).order_by(Flashcard.created_at.desc()).limit(6).all()
+
     # Get MC cards for this deck
     from app.models import MCCard
     mc_cards_list = MCCard.query.filter_by(deck_id=id).order_by(MCCard.created_at.desc()).limit(6).all()
@@ -139,6 +142,7 @@ def view(id):
         difficulty_dist=difficulty_dist,
         study_stats=study_stats,
         quick_form=quick_form,
+        recent_cards=recent_cards,
         mc_cards=mc_cards_list,
         mc_card_count=mc_card_count
     )
@@ -370,10 +374,12 @@ def filter_cards_api(deck_id):
         'sort_by': request.args.get('sort_by', 'created_desc')
     }
 
-    cards = DeckService.get_filtered_cards(deck_id, filters)
+    # Page through the matches instead of loading all of them to send 50
+    pagination = DeckService.search_deck_cards(deck_id, page=1, per_page=50, **filters)
+    cards = pagination.items if pagination else []
 
     return jsonify({
-        'count': len(cards),
+        'count': pagination.total if pagination else 0,
         'cards': [
             {
                 'id': card.id,
@@ -384,7 +390,7 @@ def filter_cards_api(deck_id):
                 'times_studied': card.times_studied,
                 'is_due': card.is_due_for_review()
             }
-            for card in cards[:50]  # Limit to 50 for performance
+            for card in cards
         ]
     })
 
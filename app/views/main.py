@@ -49,15 +49,14 @@ def dashboard():
             'stats': stats
         })
 
-    # Get decks that need attention (cards needing review)
-    decks_needing_attention = []
-    for deck in recent_decks:
-        review_cards = StudyService.get_cards_needing_review(deck.id)
-        if review_cards:
-            decks_needing_attention.append({
-                'deck': deck,
-                'review_count': len(review_cards)
-            })
+    # Get decks that need attention (cards needing review), counted for all
+    # recent decks in one query
+    due_counts = StudyService.count_due_cards_by_deck([deck.id for deck in recent_decks])
+    decks_needing_attention = [
+        {'deck': deck, 'review_count': due_counts[deck.id]}
+        for deck in recent_decks
+        if due_counts.get(deck.id)
+    ]
 
     return render_template(
         'main/dashboard.html',
@@ -5,7 +5,8 @@ Handles routes for MC study sessions and answer processing
 
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, session, abort
 from flask_login import login_required, current_user
-from app.models import Deck, MCCard, MCSession, Document
+from sqlalchemy.orm import selectinload
+from app.models import Deck, MCCard, MCSession, MCAttempt, Document
 from app.services.mc_study_service import MCStudyService
 from app.services.document_qa_service import DocumentQAService
 from app.services import DeckService
@@ -357,7 +358,10 @@ def sessions():
 @login_required
 def view_session(session_id):
     """View details of a completed session"""
-    mc_session = MCSession.query.get_or_404(session_id)
+    # Attempts and their cards come in two extra SELECTs instead of one per attempt
+    mc_session = MCSession.query.options(
+        selectinload(MCSession.attempts).selectinload(MCAttempt.card)
+    ).get_or_404(session_id)
 
     # Check ownership
     if mc_session.user_id != current_user.id:
@@ -1,3 +1,4 @@
+from datetime import datetime
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, session
 from flask_login import login_required, current_user
 from app.forms import StudyOptionsForm
@@ -314,6 +315,7 @@ def statistics(deck_id):
     # Get cards with detailed SM-2 stats
     cards = StudyService.get_deck_cards(deck_id)
     cards_with_stats = []
+    now = datetime.utcnow()
 
     for card in cards:
         health_score = StudyService.get_card_health_score(card)
@@ -324,9 +326,9 @@ def statistics(deck_id):
             'interval': card.interval,
             'repetitions': card.repetitions,
             'learning_state': card.learning_state,
-            'days_until_due': card.days_until_due(),
+            'days_until_due': card.days_until_due(now),
             'health_score': round(health_score),
-            'needs_review': card.is_due_for_review()
+            'needs_review': card.is_due_for_review(now)
         })
 
     # Sort by health score (worst first - cards that need attention)
@@ -4,11 +4,39 @@ CLI script for database and application management
 """
 
 import click
+from contextlib import contextmanager
+from sqlalchemy import event
 from app import create_app
 from app.extensions import db
-from app.models import User, Deck, Flashcard
+from app.models import User, Deck, Flashcard, MCAttempt
+from app.forms.deck_forms import CardIn
 from app.services import AuthService, DeckService, StudyService
 
+# Maximum SQL statements each hot path may issue; query-budget fails when one
+# is exceeded, so an N+1 regression shows up as a non-zero exit
+QUERY_BUDGETS = {
+    'Deck.get_cards_statistics': 1,
+    'Deck.get_difficulty_distribution': 1,
+    'Deck.to_dict_detailed': 3,
+    'Deck.search_cards': 1,
+    'MCAttempt.calculate_calibration_stats': 1,
+}
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements executed inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
 
 @click.group()
 def cli():
@@ -71,16 +99,16 @@ def create_sample_data():
 
         # Create sample flashcards
         sample_cards = [
-            {'front_text': 'Hello', 'back_text': 'Hola'},
-            {'front_text': 'Goodbye', 'back_text': 'Adiós'},
-            {'front_text': 'Please', 'back_text': 'Por favor'},
-            {'front_text': 'Thank you', 'back_text': 'Gracias'},
-            {'front_text': 'Yes', 'back_text': 'Sí'},
-            {'front_text': 'No', 'back_text': 'No'},
-            {'front_text': 'Water', 'back_text': 'Agua'},
-            {'front_text': 'Food', 'back_text': 'Comida'},
-            {'front_text': 'House', 'back_text': 'Casa'},
-            {'front_text': 'Friend', 'back_text': 'Amigo/Amiga'}
+            CardIn('Hello', 'Hola'),
+            CardIn('Goodbye', 'Adiós'),
+            CardIn('Please', 'Por favor'),
+            CardIn('Thank you', 'Gracias'),
+            CardIn('Yes', 'Sí'),
+            CardIn('No', 'No'),
+            CardIn('Water', 'Agua'),
+            CardIn('Food', 'Comida'),
+            CardIn('House', 'Casa'),
+            CardIn('Friend', 'Amigo/Amiga')
         ]
 
         StudyService.bulk_create_flashcards(deck.id, sample_cards)
@@ -107,5 +135,46 @@ def stats():
         click.echo(f'- Total Flashcards: {card_count}')
 
 
+
+@cli.command()
+@click.option('--deck-id', type=int, help='Deck to measure (defaults to the deck with the most cards)')
+def query_budget(deck_id):
+    """Check that deck and MC statistics stay within their SQL query budgets"""
+    app = create_app()
+    with app.app_context():
+        if deck_id is None:
+            deck_id = db.session.query(Flashcard.deck_id).group_by(Flashcard.deck_id).order_by(
+                db.func.count(Flashcard.id).desc()
+            ).limit(1).scalar()
+        if deck_id is None or db.session.get(Deck, deck_id) is None:
+            click.echo('No deck to measure; create one first (e.g. create-sample-data)')
+            raise SystemExit(1)
+
+        checks = {
+            'Deck.get_cards_statistics': lambda deck: deck.get_cards_statistics(),
+            'Deck.get_difficulty_distribution': lambda deck: deck.get_difficulty_distribution(),
+            'Deck.to_dict_detailed': lambda deck: deck.to_dict_detailed(),
+            'Deck.search_cards': lambda deck: deck.search_cards(query='a', sort_by='accuracy_high').all(),
+            'MCAttempt.calculate_calibration_stats': lambda deck: MCAttempt.calculate_calibration_stats(
+                MCAttempt.query.filter_by(user_id=deck.user_id)
+            ),
+        }
+
+        failed = False
+        for name, check in checks.items():
+            # Start each check from a clean session so earlier loads don't hide queries
+            db.session.expunge_all()
+            deck = db.session.get(Deck, deck_id)
+            with count_queries() as statements:
+                check(deck)
+            budget = QUERY_BUDGETS[name]
+            status = 'ok' if len(statements) <= budget else 'OVER BUDGET'
+            failed = failed or len(statements) > budget
+            click.echo(f'- {name}: {len(statements)} queries (budget {budget}) {status}')
+
+        if failed:
+            raise SystemExit(1)
+
+
 if __name__ == '__main__':
     cli()